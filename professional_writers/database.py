@@ -0,0 +1,49 @@
+import os
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+
+def env_flag(name, default=False):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+def sqlite_config(path):
+    # Pragmas (WAL, busy_timeout, ...) are applied per connection from SQLITE_PRAGMAS;
+    # the engine is Django's sqlite3 with BEGIN IMMEDIATE transactions
+    return {
+        'ENGINE': 'professional_writers.sqlite',
+        'NAME': path,
+    }
+
+
+def postgresql_config(url):
+    parts = urlsplit(url)
+    options = dict(parse_qsl(parts.query))
+    options.setdefault('connect_timeout', os.environ.get('DATABASE_CONNECT_TIMEOUT', '10'))
+    pgbouncer = env_flag('DATABASE_PGBOUNCER')
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': unquote(parts.path.lstrip('/')),
+        'USER': unquote(parts.username or ''),
+        'PASSWORD': unquote(parts.password or ''),
+        'HOST': parts.hostname or '',
+        'PORT': str(parts.port or ''),
+        'OPTIONS': options,
+        # Keep connections open between requests and check them before reuse
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        # Server-side cursors don't survive pgbouncer's transaction pooling
+        'DISABLE_SERVER_SIDE_CURSORS': pgbouncer,
+    }
+
+
+def database_config(url, default_sqlite_path):
+    """A DATABASES entry for a postgres:// or sqlite:/// URL, or the default SQLite file"""
+    if not url:
+        return sqlite_config(default_sqlite_path)
+    scheme = urlsplit(url).scheme
+    if scheme in ('postgres', 'postgresql'):
+        return postgresql_config(url)
+    if scheme == 'sqlite':
+        # sqlite:///relative/path or sqlite:////absolute/path
+        return sqlite_config(url[len('sqlite:///'):] or default_sqlite_path)
+    raise ValueError(f'Unsupported database URL scheme: {scheme}')
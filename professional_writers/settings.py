@@ -1,6 +1,9 @@
 import os
+import sys
 from dotenv import load_dotenv
 
+from .database import database_config
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -34,6 +37,8 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'writers_app.middleware.PageCacheMiddleware',
+    'writers_app.middleware.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,6 +60,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'writers_app.context_processors.navigation',
             ],
         },
     },
@@ -63,14 +69,78 @@ TEMPLATES = [
 WSGI_APPLICATION = 'professional_writers.wsgi.application'
 ASGI_APPLICATION = 'professional_writers.asgi.application'
 
-# Database
+# Database: PostgreSQL when DATABASE_URL is postgres://..., SQLite otherwise
+# (see professional_writers/database.py for the environment variables)
+DATABASE_URL = os.environ.get('DATABASE_URL')
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(DATABASE_URL, BASE_DIR / 'db.sqlite3'),
 }
 
+# Applied to every new SQLite connection (writers_app.signals). WAL lets
+# readers run alongside the single writer, and busy_timeout makes writers
+# queue for the lock instead of failing with "database is locked"
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+}
+
+# Optional read replica for the public read-only views (writers_app.routers).
+# To try it locally, copy db.sqlite3 and point REPLICA_DATABASE_URL at the
+# copy, e.g. sqlite:////tmp/replica.sqlite3
+REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = database_config(REPLICA_DATABASE_URL, None)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+elif sys.argv[1:2] == ['test']:
+    # The routing tests need the alias; as a mirror it reads the primary's test database
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['writers_app.routers.ReplicaRouter']
+
+# After writing, a visitor reads from the primary for this long (replication lag)
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# Cache: Redis when REDIS_URL is set, per-process local memory otherwise
+# (development and tests)
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Two-tier cache for view data (writers_app.tiered_cache): a per-worker LRU
+# whose entries live LOCAL_CACHE_TIMEOUT seconds in front of the cache above.
+# Rebuilds are coalesced behind a lock held for at most CACHE_LOCK_TIMEOUT;
+# other workers wait up to CACHE_WAIT_TIMEOUT for the result.
+LOCAL_CACHE_MAX_ENTRIES = 256
+LOCAL_CACHE_TIMEOUT = int(os.environ.get('LOCAL_CACHE_TIMEOUT', 5))
+CACHE_LOCK_TIMEOUT = 30
+CACHE_WAIT_TIMEOUT = 5
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+
+# Authentication: users are cached for a short TTL between requests.
+# ModelBackend stays listed so sessions created before the cached backend
+# was introduced remain valid.
+AUTHENTICATION_BACKENDS = [
+    'writers_app.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', 5 * 60))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -98,6 +168,28 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+# Static HTML export of the marketing pages (manage.py export_static_pages).
+# When enabled, WhiteNoise serves the exported pages ahead of the live views
+# (any page missing from the export falls through to Django), and static
+# assets get hashed, far-future-cacheable names. Run collectstatic first.
+STATIC_EXPORT_ENABLED = os.environ.get('STATIC_EXPORT_ENABLED', 'False').lower() == 'true'
+STATIC_EXPORT_ROOT = BASE_DIR / 'static_pages'
+STATIC_EXPORT_HOST = os.environ.get('STATIC_EXPORT_HOST', 'localhost')
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+if STATIC_EXPORT_ENABLED:
+    STORAGES['staticfiles']['BACKEND'] = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    WHITENOISE_ROOT = STATIC_EXPORT_ROOT
+    WHITENOISE_INDEX_FILE = True
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -132,15 +224,76 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:8000",
 ]
 
-# Channels
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels_redis.core.RedisChannelLayer',
-        'CONFIG': {
-            "hosts": [('127.0.0.1', 6379)],
+# Channels: Redis when REDIS_URL is set (needed to deliver across worker
+# processes); otherwise the in-memory layer, which is fine for one runserver
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                "hosts": [REDIS_URL],
+            },
         },
-    },
-}
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+
+# View caching (entries are also invalidated by model signals)
+VIEW_CACHE_TIMEOUT = int(os.environ.get('VIEW_CACHE_TIMEOUT', 60 * 60))
+HOMEPAGE_CACHE_TIMEOUT = int(os.environ.get('HOMEPAGE_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Full-page cache for anonymous visitors on the static marketing pages.
+# DEPLOY_VERSION is part of every page key, so each deploy starts cold.
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', str(not DEBUG)).lower() == 'true'
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 60 * 60 * 24))
+# Hosts (comma-separated) whose pages are cached; requests for any other
+# Host header bypass the page cache instead of creating entries
+PAGE_CACHE_HOSTS = [
+    host.strip() for host in os.environ.get('PAGE_CACHE_HOSTS', STATIC_EXPORT_HOST).split(',') if host.strip()
+]
+DEPLOY_VERSION = os.environ.get('DEPLOY_VERSION', 'dev')
+
+# Blog/sample view counters are buffered (in Redis when available, otherwise
+# per process) and written to the database every few seconds
+VIEW_COUNTER_BACKEND = 'redis' if REDIS_URL else 'memory'
+VIEW_COUNTER_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNTER_FLUSH_INTERVAL', 30))
+
+# Samples gallery: cards rendered per category before infinite scroll takes over
+SAMPLES_PAGE_SIZE = 12
+SAMPLES_PAGE_SIZE_MAX = 48
+
+# Orders per page on the customer dashboard
+DASHBOARD_ORDERS_PAGE_SIZE = int(os.environ.get('DASHBOARD_ORDERS_PAGE_SIZE', 10))
+
+# Chat history API page size (?limit= is clamped to the maximum)
+CHAT_MESSAGES_PAGE_SIZE = 50
+CHAT_MESSAGES_PAGE_SIZE_MAX = 200
+
+# WebSocket chat messages are written in batches: at most this many seconds
+# after they are sent, or as soon as the batch size is reached
+CHAT_FLUSH_INTERVAL = float(os.environ.get('CHAT_FLUSH_INTERVAL', 0.25))
+CHAT_FLUSH_BATCH_SIZE = int(os.environ.get('CHAT_FLUSH_BATCH_SIZE', 100))
+# Flushes a message may fail (other than on a constraint) before it is dropped
+CHAT_FLUSH_MAX_ATTEMPTS = int(os.environ.get('CHAT_FLUSH_MAX_ATTEMPTS', 5))
+
+# Typing indicators are broadcast when they change, and "still typing" is
+# repeated at most once per this many seconds
+CHAT_TYPING_INTERVAL = float(os.environ.get('CHAT_TYPING_INTERVAL', 2))
+
+# Admin dashboard revenue window, read from the AdminStat rollup. The rollup is
+# kept current by signals; run `manage.py recompute_admin_stats` periodically
+ADMIN_STATS_REVENUE_DAYS = int(os.environ.get('ADMIN_STATS_REVENUE_DAYS', 30))
+
+# Completed/cancelled orders untouched for this many months are moved, with
+# their chat history, into ArchivedOrder by `manage.py archive_orders`
+ORDER_ARCHIVE_AFTER_MONTHS = int(os.environ.get('ORDER_ARCHIVE_AFTER_MONTHS', 12))
+
+# Django admin changelists show estimated counts for tables larger than this
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
 
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
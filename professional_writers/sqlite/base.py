@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite whose transactions take the write lock when they begin.
+
+    A deferred BEGIN only upgrades to a write lock at the first write, and
+    if another connection is writing then SQLite fails the upgrade with
+    "database is locked" at once instead of honouring busy_timeout. BEGIN
+    IMMEDIATE queues for the lock up front, so atomic() blocks that read
+    then write wait their turn. Read-only atomic() blocks queue too, which
+    is the price of never failing mid-transaction. (Django 5.1 has
+    OPTIONS['transaction_mode'] for this.)
+    """
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
@@ -1,6 +1,6 @@
 // Django Chat WebSocket Implementation
 class DjangoChat {
-    constructor(orderId, userId, isAdmin = false) {
+    constructor(orderId, userId, isAdmin = false, lastMessageId = 0) {
         this.orderId = orderId;
         this.userId = userId;
         this.isAdmin = isAdmin;
@@ -9,10 +9,29 @@ class DjangoChat {
         this.typingTimeout = 3000;
         this.isTyping = false;
         
+        // Highest message id shown; the server sends only newer messages on sync
+        this.lastMessageId = lastMessageId;
+        this.seenIds = new Set();
+        // Keys of live messages shown but not yet saved, until 'saved' gives their ids
+        this.shownKeys = new Set();
+        this.closed = false;
+        this.reconnectTimer = null;
+        this.reconnectDelay = 1000;
+        this.maxReconnectDelay = 30000;
+        // Removes this instance's form listeners when it is closed
+        this.events = new AbortController();
+        
         this.init();
     }
     
     init() {
+        this.connect();
+        
+        // Bind form events
+        this.bindEvents();
+    }
+    
+    connect() {
         // WebSocket connection
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
         const socketUrl = `${protocol}//${window.location.host}/ws/chat/${this.orderId}/`;
@@ -22,6 +41,9 @@ class DjangoChat {
         this.socket.onopen = () => {
             console.log('Chat connected');
             this.showStatus('Connected to chat');
+            this.reconnectDelay = 1000;
+            // Catch up on whatever was sent while we were away
+            this.sync();
         };
         
         this.socket.onmessage = (event) => {
@@ -32,26 +54,42 @@ class DjangoChat {
         this.socket.onclose = () => {
             console.log('Chat disconnected');
             this.showStatus('Disconnected from chat');
+            this.scheduleReconnect();
         };
         
         this.socket.onerror = (error) => {
             console.error('Chat error:', error);
             this.showStatus('Connection error');
         };
-        
-        // Bind form events
-        this.bindEvents();
+    }
+    
+    sync() {
+        this.socket.send(JSON.stringify({
+            'type': 'sync',
+            'last_id': this.lastMessageId
+        }));
+    }
+    
+    scheduleReconnect() {
+        if (this.closed) return;
+        // Exponential backoff with jitter, so clients dropped by a deploy
+        // don't all reconnect at the same moment
+        const delay = this.reconnectDelay / 2 + Math.random() * this.reconnectDelay / 2;
+        this.reconnectDelay = Math.min(this.reconnectDelay * 2, this.maxReconnectDelay);
+        clearTimeout(this.reconnectTimer);
+        this.reconnectTimer = setTimeout(() => this.connect(), delay);
     }
     
     bindEvents() {
         const form = document.getElementById('chat-form');
         const input = document.getElementById('chat-input');
+        const options = { signal: this.events.signal };
         
         if (form) {
             form.addEventListener('submit', (e) => {
                 e.preventDefault();
                 this.sendMessage();
-            });
+            }, options);
         }
         
         if (input) {
@@ -62,11 +100,11 @@ class DjangoChat {
                 } else {
                     this.handleTyping();
                 }
-            });
+            }, options);
             
             input.addEventListener('input', () => {
                 this.handleTyping();
-            });
+            }, options);
         }
     }
     
@@ -89,17 +127,48 @@ class DjangoChat {
     
     handleMessage(data) {
         if (data.type === 'message') {
+            this.shownKeys.add(data.key);
             this.displayMessage({
                 message: data.message,
                 user_name: data.user_name,
                 is_admin: data.is_admin,
-                timestamp: data.timestamp
+                timestamp: data.timestamp || Date.now()
+            });
+        } else if (data.type === 'saved') {
+            // Ids for live messages, once the server has stored them. A key we
+            // never showed is a message we missed (e.g. it was still buffered
+            // on another worker when we synced): sync again before these ids
+            // move lastMessageId past it
+            const ids = Object.entries(data.ids);
+            if (ids.some(([key]) => !this.shownKeys.has(key))) {
+                this.sync();
+            }
+            ids.forEach(([key, id]) => {
+                if (this.shownKeys.delete(key)) {
+                    this.markSeen(id);
+                }
+            });
+        } else if (data.type === 'history') {
+            data.messages.forEach((message) => {
+                if (this.seenIds.has(message.id)) return;
+                this.markSeen(message.id);
+                this.displayMessage({
+                    message: message.message,
+                    user_name: message.user_name,
+                    is_admin: message.is_admin,
+                    timestamp: message.created_at
+                });
             });
         } else if (data.type === 'typing') {
             this.displayTyping(data.user_name, data.is_typing);
         }
     }
     
+    markSeen(id) {
+        this.seenIds.add(id);
+        this.lastMessageId = Math.max(this.lastMessageId, id);
+    }
+    
     displayMessage(data) {
         const chatMessages = document.getElementById('chat-messages');
         if (!chatMessages) return;
@@ -122,6 +191,7 @@ class DjangoChat {
     }
     
     handleTyping() {
+        if (this.socket.readyState !== WebSocket.OPEN) return;
         if (!this.isTyping) {
             this.isTyping = true;
             this.socket.send(JSON.stringify({
@@ -138,7 +208,7 @@ class DjangoChat {
     }
     
     stopTyping() {
-        if (this.isTyping) {
+        if (this.isTyping && this.socket.readyState === WebSocket.OPEN) {
             this.isTyping = false;
             this.socket.send(JSON.stringify({
                 'type': 'typing',
@@ -179,6 +249,9 @@ class DjangoChat {
     }
     
     close() {
+        this.closed = true;
+        this.events.abort();
+        clearTimeout(this.reconnectTimer);
         if (this.socket) {
             this.socket.close();
         }
@@ -196,9 +269,11 @@ document.addEventListener('DOMContentLoaded', function() {
         const orderId = chatContainer.dataset.orderId;
         const userId = chatContainer.dataset.userId;
         const isAdmin = chatContainer.dataset.isAdmin === 'true';
+        // Set when the page already rendered the history up to this message
+        const lastMessageId = parseInt(chatContainer.dataset.lastMessageId || '0', 10);
         
         if (orderId && userId) {
-            chatInstance = new DjangoChat(orderId, userId, isAdmin);
+            chatInstance = new DjangoChat(orderId, userId, isAdmin, lastMessageId);
         }
     }
 });
@@ -138,13 +138,25 @@ function handleContactForm(e) {
 function handleNewsletterForm(e) {
     e.preventDefault();
     const form = e.target;
-    const formData = new FormData(form);
     
-    fetch('/subscribe', {
-        method: 'POST',
-        body: formData
+    // Exported static pages can't embed a visitor's CSRF token, so always fetch one
+    fetch('/api/csrf/', { credentials: 'same-origin' })
+    .then(response => response.json())
+    .then(data => {
+        const formData = new FormData(form);
+        formData.set('csrfmiddlewaretoken', data.csrf_token);
+        return fetch(form.action, {
+            method: 'POST',
+            body: formData,
+            credentials: 'same-origin'
+        });
+    })
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`Subscribe failed with ${response.status}`);
+        }
+        return response.text();
     })
-    .then(response => response.text())
     .then(data => {
         showNotification('Successfully subscribed to our newsletter!', 'success');
         form.reset();
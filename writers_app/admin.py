@@ -1,15 +1,63 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
 from django import forms
 from .models import (
-    User, Service, ServicePackage, Order, ChatMessage, 
+    User, Service, ServicePackage, Order, ChatMessage, ArchivedOrder,
     BlogPost, Testimonial, FAQ, NewsletterSubscriber, ContactMessage,
     SampleCategory, ResumeSample
 )
 
 
+def estimate_table_rows(model, using='default'):
+    """Cheap row count estimate: planner statistics on PostgreSQL, the highest id elsewhere"""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been analyzed
+        return row[0] if row and row[0] >= 0 else None
+    return model._default_manager.using(using).aggregate(highest=Max('pk'))['highest'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator that stops counting exactly once a table is large.
+
+    Below ADMIN_ESTIMATED_COUNT_THRESHOLD rows the count is exact. Above it,
+    an unfiltered changelist shows the table estimate, and a filtered one
+    counts at most the threshold rows instead of scanning every match.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        threshold = settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+        estimate = estimate_table_rows(queryset.model, queryset.db)
+        if estimate is None or estimate <= threshold:
+            return super().count
+        if not queryset.query.where:
+            return estimate
+        return queryset.order_by()[:threshold].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables that grow without bound"""
+    paginator = EstimatedCountPaginator
+    # Skip the extra unfiltered COUNT(*) behind "N results (M total)"
+    show_full_result_count = False
+
+
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdmin, BaseUserAdmin):
     list_display = ['username', 'email', 'first_name', 'last_name', 'is_admin', 'is_verified', 'created_at']
     list_filter = ['is_admin', 'is_verified', 'is_active', 'date_joined']
     search_fields = ['username', 'email', 'first_name', 'last_name']
@@ -45,28 +93,59 @@ class ServiceAdmin(admin.ModelAdmin):
 class ServicePackageAdmin(admin.ModelAdmin):
     list_display = ['service', 'name', 'price_inr', 'price_usd', 'delivery_days', 'is_popular', 'is_active']
     list_filter = ['service', 'is_popular', 'is_active']
-    search_fields = ['name', 'description']
+    list_select_related = ['service']
+    search_fields = ['name', 'service__name', 'description']
+
+    def get_queryset(self, request):
+        # ServicePackage.__str__ includes the service name, e.g. in Order's package autocomplete
+        return super().get_queryset(request).select_related(*self.list_select_related)
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(LargeTableAdmin):
     list_display = ['order_number', 'user', 'service_package', 'status', 'payment_status', 'amount', 'currency', 'created_at']
     list_filter = ['status', 'payment_status', 'currency', 'created_at']
+    list_select_related = ['user', 'service_package__service']
     search_fields = ['order_number', 'user__username', 'user__email']
+    autocomplete_fields = ['user', 'service_package']
     readonly_fields = ['order_number']
 
+    def get_queryset(self, request):
+        # Also used by the autocomplete views, where Order.__str__ shows the user's
+        # name; the changelist skips list_select_related once select_related is set
+        return super().get_queryset(request).select_related(*self.list_select_related)
+
 
 @admin.register(ChatMessage)
-class ChatMessageAdmin(admin.ModelAdmin):
+class ChatMessageAdmin(LargeTableAdmin):
     list_display = ['order', 'user', 'is_admin', 'created_at']
     list_filter = ['is_admin', 'created_at']
+    list_select_related = ['order__user', 'user']
     search_fields = ['message', 'user__username']
+    autocomplete_fields = ['order', 'user']
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(LargeTableAdmin):
+    list_display = ['order_number', 'user', 'service_name', 'status', 'payment_status', 'amount', 'currency', 'created_at', 'archived_at']
+    list_filter = ['status', 'payment_status', 'archived_at']
+    list_select_related = ['user']
+    search_fields = ['order_number', 'user__username', 'user__email']
+    exclude = ['payload']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
     list_display = ['title', 'author', 'is_published', 'is_featured', 'view_count', 'published_at']
     list_filter = ['is_published', 'is_featured', 'created_at']
+    list_select_related = ['author']
+    autocomplete_fields = ['author']
     search_fields = ['title', 'content']
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'published_at'
@@ -76,7 +155,9 @@ class BlogPostAdmin(admin.ModelAdmin):
 class TestimonialAdmin(admin.ModelAdmin):
     list_display = ['user', 'rating', 'is_featured', 'is_approved', 'company', 'created_at']
     list_filter = ['rating', 'is_featured', 'is_approved', 'created_at']
+    list_select_related = ['user']
     search_fields = ['content', 'user__username', 'company']
+    autocomplete_fields = ['user']
 
 
 @admin.register(FAQ)
@@ -186,6 +267,7 @@ class SampleCategoryAdmin(admin.ModelAdmin):
 @admin.register(ResumeSample)
 class ResumeSampleAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'sample_type', 'is_featured', 'is_active', 'view_count', 'created_at']
+    list_select_related = ['category']
     list_filter = ['category', 'sample_type', 'is_featured', 'is_active', 'created_at']
     search_fields = ['title']
     list_editable = ['is_featured', 'is_active']
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class WritersAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'writers_app'
\ No newline at end of file
+    name = 'writers_app'
+
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import signals  # noqa: F401
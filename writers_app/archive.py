@@ -0,0 +1,123 @@
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Order, ChatMessage, ArchivedOrder, Testimonial
+from .stats import preserve_order_stats
+
+ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+
+# What happens to each model that points at Order when an order is archived:
+# chat messages are copied into the payload and deleted with the order,
+# testimonials outlive it and are detached first
+ARCHIVED_RELATIONS = {ChatMessage}
+DETACHED_RELATIONS = {Testimonial}
+
+
+def check_order_relations():
+    """Refuse to archive if a model added since could be cascaded away with the orders"""
+    unhandled = [
+        f'{relation.related_model.__name__}.{relation.field.name}'
+        for relation in Order._meta.related_objects
+        if relation.related_model not in ARCHIVED_RELATIONS | DETACHED_RELATIONS
+    ]
+    if unhandled:
+        raise RuntimeError(
+            'Archiving would delete rows referencing Order through '
+            f'{", ".join(unhandled)}; add them to ARCHIVED_RELATIONS or DETACHED_RELATIONS'
+        )
+
+
+def archivable_orders(months=None):
+    """Completed or cancelled orders untouched for the given number of (30-day) months"""
+    months = settings.ORDER_ARCHIVE_AFTER_MONTHS if months is None else months
+    cutoff = timezone.now() - timedelta(days=30 * months)
+    return Order.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=cutoff)
+
+
+def _fields(obj):
+    # The serializer handles file, JSON and decimal fields the same way dumpdata does
+    data = serializers.serialize('python', [obj])[0]['fields']
+    data['id'] = obj.pk
+    return data
+
+
+def pack_order(order):
+    """Compress an order (with chat_messages prefetched) into an archive payload"""
+    data = {
+        'order': _fields(order),
+        'messages': [
+            dict(_fields(message), user_name=message.user.get_full_name())
+            for message in order.chat_messages.all()
+        ],
+    }
+    return zlib.compress(json.dumps(data, cls=DjangoJSONEncoder).encode())
+
+
+def unpack_order(archived_order):
+    """Decompress an archive payload, parsing the timestamps back into datetimes"""
+    data = json.loads(zlib.decompress(bytes(archived_order.payload)))
+    for message in data['messages']:
+        message['created_at'] = parse_datetime(message['created_at'])
+    order = data['order']
+    for field in ('deadline', 'delivered_at', 'created_at', 'updated_at'):
+        if order.get(field):
+            order[field] = parse_datetime(order[field])
+    return data
+
+
+def archive_orders(months=None, batch_size=500):
+    """
+    Move archivable orders and their chat messages into ArchivedOrder.
+
+    Works in batches, each in its own transaction, so the hot tables are
+    only locked briefly. Returns the number of orders archived.
+    """
+    check_order_relations()
+    archived = 0
+    while True:
+        with transaction.atomic():
+            orders = list(
+                archivable_orders(months)
+                .select_related('service_package__service')
+                .prefetch_related(Prefetch(
+                    'chat_messages',
+                    queryset=ChatMessage.objects.select_related('user').order_by('id'),
+                ))
+                .order_by('pk')[:batch_size]
+            )
+            if not orders:
+                return archived
+
+            ArchivedOrder.objects.bulk_create([
+                ArchivedOrder(
+                    original_id=order.pk,
+                    order_number=order.order_number,
+                    user_id=order.user_id,
+                    service_name=order.service_package.service.name,
+                    package_name=order.service_package.name,
+                    status=order.status,
+                    payment_status=order.payment_status,
+                    amount=order.amount,
+                    currency=order.currency,
+                    message_count=len(order.chat_messages.all()),
+                    payload=pack_order(order),
+                    created_at=order.created_at,
+                )
+                for order in orders
+            ])
+            batch = Order.objects.filter(pk__in=[order.pk for order in orders])
+            # Testimonial.order cascades; the testimonial should outlive the order
+            Testimonial.objects.filter(order__in=batch).update(order=None)
+            # The orders still count towards the admin totals from the archive
+            with preserve_order_stats():
+                batch.delete()
+        archived += len(orders)
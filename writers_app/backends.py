@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .cache import user_cache_key
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that keeps authenticated users in the cache for a short TTL.
+
+    AuthenticationMiddleware and the Channels AuthMiddlewareStack both call
+    get_user() on every request/connect; this turns that SELECT into a cache
+    read. The entry is dropped whenever the user is saved or deleted.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+from .routers import read_from_primary
+from .tiered_cache import tiered_cache
+
+
+HOMEPAGE_CONTEXT_KEY = 'writers_app:homepage_context'
+SAMPLES_CONTEXT_KEY = 'writers_app:samples_context'
+PRICING_MATRIX_KEY = 'writers_app:pricing_matrix'
+NAV_SERVICES_KEY = 'writers_app:nav_services'
+TESTIMONIAL_COUNT_KEY = 'writers_app:testimonial_count'
+BLOG_POST_COUNT_KEY = 'writers_app:blog_post_count'
+USER_KEY_PREFIX = 'writers_app:user'
+
+PAGE_KEY_PREFIX = 'writers_app:page'
+PAGE_GENERATION_KEY = 'writers_app:page_generation'
+
+# Rendered into cached pages in place of the per-visitor CSRF token
+CSRF_TOKEN_PLACEHOLDER = '__writers_app_csrf_token__'
+
+# Response headers that must not be replayed from a cached page
+UNCACHED_PAGE_HEADERS = {'content-length', 'x-page-cache'}
+
+STATS_KEY_PREFIX = 'writers_app:cache_stats'
+
+
+def _stats_key(name, outcome):
+    return f'{STATS_KEY_PREFIX}:{name}:{outcome}'
+
+
+def _record(name, outcome):
+    """Increment the shared hit/miss counter for a cached block"""
+    key = _stats_key(name, outcome)
+    try:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+    except ValueError:
+        # Counter was evicted between add() and incr(); drop this sample
+        pass
+
+
+def get_or_build(key, builder, timeout=None, stats_name=None):
+    """Return the cached value for key, building it once across workers on a miss"""
+    if timeout is None:
+        timeout = getattr(settings, 'VIEW_CACHE_TIMEOUT', 60 * 60)
+    value, hit = tiered_cache.get_or_set(key, lambda: _build_on_primary(builder), timeout)
+    _record(stats_name or key, 'hits' if hit else 'misses')
+    return value
+
+
+def _build_on_primary(builder):
+    # Shared values outlive replication lag, so never build them from the replica
+    with read_from_primary():
+        return builder()
+
+
+def invalidate(*keys):
+    """Drop cached values so the next request rebuilds them"""
+    tiered_cache.delete_many(keys)
+
+
+def cache_stats(name):
+    """Return the hit/miss counters recorded for a cached block"""
+    hits = cache.get(_stats_key(name, 'hits'), 0)
+    misses = cache.get(_stats_key(name, 'misses'), 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_cache_stats(name):
+    cache.delete_many([_stats_key(name, 'hits'), _stats_key(name, 'misses')])
+
+
+def user_cache_key(user_id):
+    return f'{USER_KEY_PREFIX}:{user_id}'
+
+
+def page_generation():
+    """Counter bumped whenever content shared by every page (navigation) changes"""
+    return tiered_cache.get(PAGE_GENERATION_KEY) or 0
+
+
+def expire_cached_pages():
+    """Orphan every cached page by moving to the next generation"""
+    try:
+        cache.incr(PAGE_GENERATION_KEY)
+    except ValueError:
+        cache.add(PAGE_GENERATION_KEY, 1, None)
+    tiered_cache.local.delete(PAGE_GENERATION_KEY)
+
+
+def page_cacheable_host(request):
+    """
+    Pages are only cached for the configured hosts. The key has to include
+    the host (pages render absolute URLs), and with ALLOWED_HOSTS = ['*'] a
+    client-chosen Host header would otherwise create a new entry each time
+    """
+    return request.get_host() in settings.PAGE_CACHE_HOSTS
+
+
+def page_cache_key(request):
+    """Key a cached page on deploy version, page generation, host and path"""
+    return (
+        f'{PAGE_KEY_PREFIX}:{settings.DEPLOY_VERSION}:{page_generation()}:'
+        f'{request.get_host()}:{request.path}'
+    )
+
+
+def store_page(request, response, content):
+    """Store a rendered page (with the CSRF placeholder) and its headers"""
+    headers = [
+        (header, value) for header, value in response.headers.items()
+        if header.lower() not in UNCACHED_PAGE_HEADERS
+    ]
+    cache.set(
+        page_cache_key(request),
+        {'content': content, 'headers': headers},
+        settings.PAGE_CACHE_TIMEOUT,
+    )
+
+
+def get_cached_page(request):
+    return cache.get(page_cache_key(request))
+
+
+def build_page_response(request, page):
+    """Turn a cached page into a response carrying this visitor's CSRF token"""
+    content = page['content'].replace(
+        CSRF_TOKEN_PLACEHOLDER.encode(), get_token(request).encode()
+    )
+    response = HttpResponse(content)
+    for header, value in page['headers']:
+        response.headers[header] = value
+    response.headers['X-Page-Cache'] = 'hit'
+    return response
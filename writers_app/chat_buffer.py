@@ -0,0 +1,173 @@
+import asyncio
+import atexit
+import logging
+import threading
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import DataError, DatabaseError, IntegrityError
+
+from .models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+def chat_group_name(order_id):
+    """The channel layer group for an order's chat room"""
+    return f'chat_{order_id}'
+
+
+class ChatMessageBuffer:
+    """
+    Write-behind buffer for chat messages, one per worker process.
+
+    Consumers add unsaved ChatMessage objects and return immediately; they
+    are written with one bulk_create per CHAT_FLUSH_INTERVAL window, or as
+    soon as CHAT_FLUSH_BATCH_SIZE are waiting. Whatever is still buffered
+    is written when a socket disconnects and when the process exits.
+
+    If a batch fails it is retried row by row, so one bad row can't block
+    the rest: rows that violate a constraint (e.g. their order was deleted
+    or archived while they waited) are logged and dropped, and rows that
+    hit any other database error are requeued, up to
+    CHAT_FLUSH_MAX_ATTEMPTS flushes.
+
+    Each message carries a transient chat_key that was broadcast with it;
+    once saved, its room is told the key -> id mapping so clients know the
+    last message id they have seen.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        # Held while draining and writing, so batches are inserted in send order
+        self._write_lock = threading.Lock()
+        self._timer = None
+        # Running flush tasks; the event loop only keeps weak references
+        self._tasks = set()
+        self._registered_exit_flush = False
+
+    def add(self, message):
+        """Queue a message; must be called from the event loop"""
+        with self._pending_lock:
+            self._pending.append(message)
+            waiting = len(self._pending)
+            if not self._registered_exit_flush:
+                atexit.register(self._flush_at_exit)
+                self._registered_exit_flush = True
+
+        if waiting >= settings.CHAT_FLUSH_BATCH_SIZE:
+            self._spawn(self.flush())
+        else:
+            self._schedule()
+
+    def _schedule(self):
+        # A timer left on another loop (closed, or a previous asyncio.run) never fires here
+        if self._timer is None or self._timer.done() or self._timer.get_loop() is not asyncio.get_running_loop():
+            self._timer = self._spawn(self._flush_later())
+
+    def _spawn(self, coroutine):
+        task = asyncio.get_running_loop().create_task(self._logged(coroutine))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _logged(self, coroutine):
+        try:
+            await coroutine
+        except Exception:
+            logger.exception('Flushing buffered chat messages failed')
+
+    async def _flush_later(self):
+        await asyncio.sleep(settings.CHAT_FLUSH_INTERVAL)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Write everything buffered so far; returns the number of messages saved"""
+        batch = await database_sync_to_async(self._write_pending)()
+        await self._announce(batch)
+        if self.pending_count():
+            # Requeued rows get another window rather than waiting for new traffic
+            self._schedule()
+        return len(batch)
+
+    def flush_sync(self):
+        return len(self._write_pending())
+
+    def _flush_at_exit(self):
+        try:
+            self.flush_sync()
+        except Exception:
+            logger.exception('Flushing buffered chat messages at exit failed')
+
+    def _write_pending(self):
+        """Insert the buffered messages; returns the ones saved"""
+        with self._write_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return batch
+            try:
+                ChatMessage.objects.bulk_create(batch)
+                return batch
+            except DatabaseError:
+                logger.warning('Saving %d chat messages failed; retrying one by one', len(batch), exc_info=True)
+            return self._write_each(batch)
+
+    def _write_each(self, batch):
+        saved, retry = [], []
+        for message in batch:
+            # A rolled-back bulk insert may have assigned ids already
+            message.pk = None
+            if retry:
+                # The database is failing; keep the rest, in order, for the next flush
+                retry.append(message)
+                continue
+            try:
+                ChatMessage.objects.bulk_create([message])
+                saved.append(message)
+            except (IntegrityError, DataError):
+                logger.error(
+                    'Dropping chat message from user %s for order %s: it can never be saved',
+                    message.user_id, message.order_id, exc_info=True,
+                )
+            except DatabaseError:
+                logger.warning('Saving chat messages failed; requeueing', exc_info=True)
+                retry.append(message)
+        if retry:
+            self._requeue(retry)
+        return saved
+
+    def _requeue(self, messages):
+        kept = []
+        for message in messages:
+            message.flush_attempts = getattr(message, 'flush_attempts', 0) + 1
+            if message.flush_attempts >= settings.CHAT_FLUSH_MAX_ATTEMPTS:
+                logger.error(
+                    'Dropping chat message from user %s for order %s after %d failed flushes',
+                    message.user_id, message.order_id, message.flush_attempts,
+                )
+            else:
+                kept.append(message)
+        # Ahead of anything buffered since, to keep send order
+        with self._pending_lock:
+            self._pending[:0] = kept
+
+    async def _announce(self, batch):
+        rooms = {}
+        for message in batch:
+            # bulk_create only sets pks on backends that support RETURNING
+            if message.pk is not None and getattr(message, 'chat_key', None):
+                rooms.setdefault(message.order_id, {})[message.chat_key] = message.pk
+        channel_layer = get_channel_layer()
+        for order_id, ids in rooms.items():
+            await channel_layer.group_send(chat_group_name(order_id), {'type': 'chat_saved', 'ids': ids})
+
+    def pending_count(self):
+        with self._pending_lock:
+            return len(self._pending)
+
+
+chat_buffer = ChatMessageBuffer()
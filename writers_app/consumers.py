@@ -1,17 +1,34 @@
 import json
+import time
+import uuid
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
+from django.conf import settings
+from .chat_buffer import chat_buffer, chat_group_name
 from .models import Order, ChatMessage
-
-User = get_user_model()
+from .views import CHAT_MESSAGE_FIELDS, serialize_chat_message
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.order_id = self.scope['url_route']['kwargs']['order_id']
-        self.room_group_name = f'chat_{self.order_id}'
-        
+        self.room_group_name = chat_group_name(self.order_id)
+        self.user = self.scope['user']
+        # Last typing state broadcast for this socket, and when
+        self.typing = False
+        self.typing_sent_at = 0.0
+
+        # Membership is checked once here; messages on this socket are then
+        # trusted to come from self.user without another lookup
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+        self.is_support = self.user.is_staff or self.user.is_admin
+        owner_id = await self.get_order_owner()
+        if owner_id is None or (owner_id != self.user.id and not self.is_support):
+            await self.close()
+            return
+
         # Join room group
         await self.channel_layer.group_add(
             self.room_group_name,
@@ -21,94 +38,159 @@ class ChatConsumer(AsyncWebsocketConsumer):
         await self.accept()
 
     async def disconnect(self, close_code):
+        # Don't leave the others looking at a stale "is typing..."
+        await self.set_typing(False)
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
+        # Don't leave this socket's messages waiting for the next flush window
+        await chat_buffer.flush()
+
+    @database_sync_to_async
+    def get_order_owner(self):
+        return Order.objects.filter(id=self.order_id).values_list('user_id', flat=True).first()
+
+    @database_sync_to_async
+    def get_messages_after(self, last_id, limit):
+        # One extra row tells us whether another page follows
+        rows = list(
+            ChatMessage.objects.filter(order_id=self.order_id, id__gt=last_id)
+            .values(*CHAT_MESSAGE_FIELDS).order_by('id')[:limit + 1]
+        )
+        return [serialize_chat_message(row) for row in rows[:limit]], len(rows) > limit
+
+    async def send_history(self, last_id):
+        """Stream the messages after last_id in pages, oldest first"""
+        # Anything this process is still buffering belongs in the delta
+        await chat_buffer.flush()
+        limit = settings.CHAT_MESSAGES_PAGE_SIZE
+        has_more = True
+        while has_more:
+            messages, has_more = await self.get_messages_after(last_id, limit)
+            await self.send(text_data=json.dumps({
+                'type': 'history',
+                'messages': messages,
+                'has_more': has_more,
+            }))
+            if messages:
+                last_id = messages[-1]['id']
+
+    def sender_name(self, is_admin):
+        """Display name for messages sent on this socket, from the authenticated scope"""
+        if is_admin:
+            return "Support Team"
+        return self.user.get_full_name()
+
+    async def set_typing(self, is_typing):
+        """
+        Broadcast this socket's typing state, coalesced.
+
+        Only changes are sent, plus a "still typing" refresh at most every
+        CHAT_TYPING_INTERVAL seconds; repeats in between are dropped here
+        rather than fanned out through the channel layer.
+        """
+        now = time.monotonic()
+        if is_typing == self.typing and (
+            not is_typing or now - self.typing_sent_at < settings.CHAT_TYPING_INTERVAL
+        ):
+            return
+        self.typing = is_typing
+        self.typing_sent_at = now
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'typing_indicator',
+                'sender_channel': self.channel_name,
+                'user_id': self.user.id,
+                'user_name': self.sender_name(False),
+                'is_typing': is_typing,
+            }
+        )
 
     # Receive message from WebSocket
     async def receive(self, text_data):
         text_data_json = json.loads(text_data)
         message_type = text_data_json.get('type', 'message')
-        
+
+        # The sender is the authenticated user, whatever the frame claims
+        claimed_user_id = text_data_json.get('user_id')
+        if claimed_user_id is not None and str(claimed_user_id) != str(self.user.id):
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'error': 'user_id does not match the signed-in user',
+            }))
+            return
+
         if message_type == 'message':
-            message = text_data_json['message']
-            user_id = text_data_json['user_id']
-            is_admin = text_data_json.get('is_admin', False)
-            
-            # Save message to database
-            await self.save_message(user_id, message, is_admin)
+            message = text_data_json.get('message', '').strip()
+            if not message:
+                return
+            is_admin = self.is_support
+
+            # Buffered and written with the next bulk_create; the key ties
+            # this broadcast to the id announced once it is saved
+            chat_message = ChatMessage(
+                order_id=self.order_id,
+                user_id=self.user.id,
+                message=message,
+                is_admin=is_admin,
+            )
+            chat_message.chat_key = uuid.uuid4().hex
+            chat_buffer.add(chat_message)
             
-            # Send message to room group
+            # Send message to room group; the sender's name travels with the
+            # event so recipients don't look it up
             await self.channel_layer.group_send(
                 self.room_group_name,
                 {
                     'type': 'chat_message',
+                    'key': chat_message.chat_key,
                     'message': message,
-                    'user_id': user_id,
+                    'user_id': self.user.id,
+                    'user_name': self.sender_name(is_admin),
                     'is_admin': is_admin,
                 }
             )
+        elif message_type == 'sync':
+            try:
+                last_id = int(text_data_json.get('last_id') or 0)
+            except (TypeError, ValueError):
+                await self.send(text_data=json.dumps({
+                    'type': 'error',
+                    'error': 'last_id must be an integer',
+                }))
+                return
+            await self.send_history(last_id)
         elif message_type == 'typing':
-            user_id = text_data_json['user_id']
-            is_typing = text_data_json['is_typing']
-            
-            # Send typing indicator to room group
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'typing_indicator',
-                    'user_id': user_id,
-                    'is_typing': is_typing,
-                }
-            )
+            await self.set_typing(bool(text_data_json.get('is_typing')))
 
     # Receive message from room group
     async def chat_message(self, event):
-        message = event['message']
-        user_id = event['user_id']
-        is_admin = event['is_admin']
-        
-        # Get user name
-        user_name = await self.get_user_name(user_id, is_admin)
-        
         # Send message to WebSocket
         await self.send(text_data=json.dumps({
-            'message': message,
-            'user_name': user_name,
-            'is_admin': is_admin,
+            'type': 'message',
+            'key': event['key'],
+            'message': event['message'],
+            'user_name': event['user_name'],
+            'is_admin': event['is_admin'],
         }))
 
-    @database_sync_to_async
-    def save_message(self, user_id, message, is_admin):
-        user = User.objects.get(id=user_id)
-        order = Order.objects.get(id=self.order_id)
-        ChatMessage.objects.create(
-            user=user,
-            order=order,
-            message=message,
-            is_admin=is_admin
-        )
+    # Buffered messages were saved: tell clients their ids
+    async def chat_saved(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'saved',
+            'ids': event['ids'],
+        }))
 
     # Handle typing indicator
     async def typing_indicator(self, event):
-        user_id = event['user_id']
-        is_typing = event['is_typing']
-        
-        # Get user name
-        user_name = await self.get_user_name(user_id, False)
-        
+        if event['sender_channel'] == self.channel_name:
+            return  # The typist doesn't need their own indicator
         # Send typing indicator to WebSocket
         await self.send(text_data=json.dumps({
             'type': 'typing',
-            'user_name': user_name,
-            'is_typing': is_typing,
+            'user_name': event['user_name'],
+            'is_typing': event['is_typing'],
         }))
-
-    @database_sync_to_async
-    def get_user_name(self, user_id, is_admin):
-        if is_admin:
-            return "Support Team"
-        user = User.objects.get(id=user_id)
-        return user.get_full_name()
\ No newline at end of file
@@ -0,0 +1,29 @@
+from django.urls import NoReverseMatch, reverse
+
+from .cache import NAV_SERVICES_KEY, get_or_build
+from .models import Service
+
+
+def build_nav_services():
+    """Resolve the active services into plain menu entries"""
+    entries = []
+    for service in Service.objects.filter(is_active=True).only('name', 'slug', 'icon', 'details_url'):
+        try:
+            url = reverse(service.get_learn_more_url())
+        except NoReverseMatch:
+            url = service.get_absolute_url()
+        entries.append({
+            'name': service.name,
+            'slug': service.slug,
+            'icon': service.icon,
+            'url': url,
+        })
+    return entries
+
+
+def navigation(request):
+    """Service menu shared by the navbar and footer on every page"""
+    # Invalidated by the signal handlers in writers_app.signals
+    return {
+        'nav_services': get_or_build(NAV_SERVICES_KEY, build_nav_services, stats_name='navigation'),
+    }
@@ -0,0 +1,131 @@
+import atexit
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+from .models import BlogPost, ResumeSample
+
+logger = logging.getLogger(__name__)
+
+COUNTED_MODELS = {model._meta.model_name: model for model in (BlogPost, ResumeSample)}
+
+
+class MemoryCounterStore:
+    """Per-process buffer; anything not yet flushed is lost if the worker dies"""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, label, pk, amount=1):
+        with self._lock:
+            self._counts[(label, pk)] += amount
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return counts
+
+
+class RedisCounterStore:
+    """Buffer shared by every worker in a Redis hash; any process can drain it"""
+
+    KEY = 'writers_app:view_counts'
+
+    def __init__(self, url):
+        import redis
+        self.errors = redis.RedisError
+        self.client = redis.Redis.from_url(url)
+
+    def incr(self, label, pk, amount=1):
+        try:
+            self.client.hincrby(self.KEY, f'{label}:{pk}', amount)
+        except self.errors:
+            # A lost page view is better than a failed page
+            logger.warning('Could not buffer view of %s %s', label, pk, exc_info=True)
+
+    def drain(self):
+        # RENAME is atomic, so concurrent drains never see the same increments
+        draining = f'{self.KEY}:draining:{uuid.uuid4().hex}'
+        try:
+            self.client.rename(self.KEY, draining)
+        except self.errors:
+            return Counter()  # Nothing buffered
+        raw = self.client.hgetall(draining)
+        self.client.delete(draining)
+
+        counts = Counter()
+        for field, value in raw.items():
+            label, pk = field.decode().split(':')
+            counts[(label, int(pk))] += int(value)
+        return counts
+
+
+_store = None
+_store_lock = threading.Lock()
+_flusher = None
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.VIEW_COUNTER_BACKEND == 'redis':
+                _store = RedisCounterStore(settings.REDIS_URL)
+            else:
+                _store = MemoryCounterStore()
+        return _store
+
+
+def record_view(obj):
+    """Count a view of a BlogPost or ResumeSample without writing to the database"""
+    get_store().incr(obj._meta.model_name, obj.pk)
+    _ensure_flusher()
+
+
+def flush_view_counts():
+    """Apply buffered views with one F() UPDATE per row; returns the rows touched"""
+    store = get_store()
+    counts = store.drain()
+    if not counts:
+        return 0
+
+    try:
+        with transaction.atomic():
+            for (label, pk), amount in counts.items():
+                # update() leaves updated_at alone and sends no post_save
+                COUNTED_MODELS[label].objects.filter(pk=pk).update(view_count=F('view_count') + amount)
+    except Exception:
+        # Put the views back so the next flush retries them
+        for (label, pk), amount in counts.items():
+            store.incr(label, pk, amount)
+        raise
+    return len(counts)
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(settings.VIEW_COUNTER_FLUSH_INTERVAL)
+        try:
+            flush_view_counts()
+        except Exception:
+            logger.exception('Flushing view counters failed')
+        finally:
+            connections.close_all()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _store_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_periodically, name='view-counter-flush', daemon=True)
+            _flusher.start()
+            atexit.register(flush_view_counts)
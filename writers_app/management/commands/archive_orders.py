@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from writers_app.archive import archivable_orders, archive_orders
+
+
+class Command(BaseCommand):
+    help = (
+        'Move completed/cancelled orders older than ORDER_ARCHIVE_AFTER_MONTHS, with '
+        'their chat messages, into the compressed ArchivedOrder table'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, help='Override ORDER_ARCHIVE_AFTER_MONTHS')
+        parser.add_argument('--batch-size', type=int, default=500, help='Orders archived per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the orders that would be archived')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archivable_orders(options['months']).count()
+            self.stdout.write(f'{count} orders would be archived')
+            return
+        count = archive_orders(options['months'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {count} orders'))
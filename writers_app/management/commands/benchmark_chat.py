@@ -0,0 +1,250 @@
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from writers_app.chat_buffer import chat_buffer
+from writers_app.models import User, Service, ServicePackage, Order
+from writers_app.routing import websocket_urlpatterns
+
+from .benchmark_order_writes import percentile
+
+LAYERS = {
+    'memory': lambda url: {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
+    'redis': lambda url: {'BACKEND': 'channels_redis.core.RedisChannelLayer', 'CONFIG': {'hosts': [url]}},
+}
+
+
+class QueryCounter:
+    """Counts queries on every connection opened while installed, including the consumers' thread pool"""
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, sender, connection, **kwargs):
+        # Fires on every reconnect of the same DatabaseWrapper
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def take(self):
+        """The queries since the last take()"""
+        with self.lock:
+            count, self.count = self.count, 0
+        return count
+
+
+def as_user(application, user):
+    """Put the user in the scope, as AuthMiddlewareStack would"""
+    async def app(scope, receive, send):
+        return await application(dict(scope, user=user), receive, send)
+    return app
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive N chat rooms x M WebSocket clients against ChatConsumer on a throwaway '
+        'test database and report round-trip latency, messages per second and DB '
+        'queries per message, for each channel layer. The --max-*/--min-* options '
+        'turn it into a regression gate that fails when a threshold is missed. '
+        'Needs daphne (channels.testing imports it) from requirements.txt'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=20, help='Concurrent chat rooms')
+        parser.add_argument('--clients', type=int, default=5, help='Sockets per room')
+        parser.add_argument('--messages', type=int, default=50, help='Messages sent in each room')
+        parser.add_argument(
+            '--layers', default='memory,redis' if settings.REDIS_URL else 'memory',
+            help=f'Comma-separated channel layers to run: {", ".join(LAYERS)} '
+                 '(default: both when REDIS_URL is set, otherwise memory)',
+        )
+        parser.add_argument(
+            '--redis-url', default=settings.REDIS_URL or 'redis://127.0.0.1:6379/15',
+            help='Redis for the redis layer; needs a running redis-server (there is no in-process fallback)',
+        )
+        parser.add_argument('--timeout', type=float, default=5, help='Seconds to wait for a delivery')
+        parser.add_argument('--max-p95-ms', type=float, help='Fail if p95 round trip exceeds this')
+        parser.add_argument('--min-rate', type=float, help='Fail if fewer messages per second are sent')
+        parser.add_argument('--max-queries-per-message', type=float, help='Fail above this many queries')
+
+    def handle(self, *args, **options):
+        layers = [name.strip() for name in options['layers'].split(',') if name.strip()]
+        unknown = set(layers) - set(LAYERS)
+        if unknown:
+            raise CommandError(f'Unknown channel layer(s): {", ".join(sorted(unknown))}')
+
+        old_name = connection.settings_dict['NAME']
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == 'sqlite':
+                # Consumers query from a thread pool, which can't share an in-memory database
+                connection.settings_dict['TEST']['NAME'] = str(Path(tmp) / 'benchmark.sqlite3')
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            queries = QueryCounter()
+            connection_created.connect(queries.install)
+            try:
+                rooms = self.seed(options['rooms'])
+                results = asyncio.run(self.run_layers(layers, rooms, queries, options))
+            finally:
+                connection_created.disconnect(queries.install)
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                connection.settings_dict['TEST']['NAME'] = None
+
+        failures = []
+        for name, result in results:
+            self.report(name, options, result)
+            failures.extend(f'{name}: {failure}' for failure in self.regressions(result, options))
+        if failures:
+            raise CommandError('Chat benchmark regressed:\n  ' + '\n  '.join(failures))
+
+    def seed(self, room_count):
+        service = Service.objects.create(name='Benchmark', description='-', short_description='-', icon='fa-star')
+        package = ServicePackage.objects.create(
+            service=service, name='Basic', description='-', price_inr=1, price_usd=1,
+            delivery_days=1, revisions=1,
+        )
+        support = User.objects.create_user('bench-support', 'support@example.com', is_staff=True)
+        rooms = []
+        for number in range(room_count):
+            owner = User.objects.create_user(f'bench{number}', f'bench{number}@example.com')
+            order = Order.objects.create(
+                order_number=f'BC{number:08d}', user=owner, service_package=package,
+                amount=1, requirements='-', deadline=timezone.now(),
+            )
+            rooms.append((order.pk, owner, support))
+        return rooms
+
+    async def run_layers(self, layers, rooms, queries, options):
+        results = []
+        for name in layers:
+            config = LAYERS[name](options['redis_url'])
+            with override_settings(CHANNEL_LAYERS={'default': config}):
+                if name == 'redis' and not await self.redis_available(options['redis_url']):
+                    self.stderr.write(self.style.WARNING(
+                        f'Skipping the redis layer: nothing answering at {options["redis_url"]}'
+                    ))
+                    continue
+                results.append((name, await self.run_layer(rooms, queries, options)))
+        return results
+
+    async def redis_available(self, url):
+        import redis.asyncio as redis
+        client = redis.Redis.from_url(url)
+        try:
+            await client.ping()
+            return True
+        except (redis.RedisError, OSError):
+            return False
+        finally:
+            await client.close()
+
+    async def run_layer(self, rooms, queries, options):
+        application = URLRouter(websocket_urlpatterns)
+        queries.take()
+        sockets = []
+        for order_id, owner, support in rooms:
+            room = []
+            for number in range(options['clients']):
+                # The owner plus support staff, like a busy support conversation
+                user = owner if number == 0 else support
+                communicator = WebsocketCommunicator(as_user(application, user), f'/ws/chat/{order_id}/')
+                connected, _ = await communicator.connect(timeout=options['timeout'])
+                if not connected:
+                    raise CommandError(f'Socket for order {order_id} was refused')
+                room.append(communicator)
+            sockets.append(room)
+        connect_queries = queries.take()
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*[
+            self.drive_room(number, room, options) for number, room in enumerate(sockets)
+        ])
+        elapsed = time.perf_counter() - started
+        # Whatever is still buffered is part of the cost of these messages
+        await chat_buffer.flush()
+        message_queries = queries.take()
+
+        for room in sockets:
+            for communicator in room:
+                await communicator.disconnect()
+
+        sent = len(rooms) * options['messages']
+        return {
+            'latencies': [ms for room in latencies for ms in room],
+            'sent': sent,
+            'delivered': sent * options['clients'],
+            'elapsed': elapsed,
+            'connect_queries': connect_queries / max(1, len(rooms) * options['clients']),
+            'queries_per_message': message_queries / max(1, sent),
+        }
+
+    async def drive_room(self, number, room, options):
+        """Send messages one at a time, timing each until every socket in the room has it"""
+        latencies = []
+        for i in range(options['messages']):
+            text = f'room {number} message {i}'
+            sender = room[i % len(room)]
+            started = time.perf_counter()
+            await sender.send_json_to({'type': 'message', 'message': text})
+            for communicator in room:
+                await self.receive_message(communicator, text, options['timeout'])
+                latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    async def receive_message(self, communicator, text, timeout):
+        while True:
+            frame = await communicator.receive_json_from(timeout=timeout)
+            # 'saved' frames (ids for flushed messages) arrive in between
+            if frame['type'] == 'message' and frame['message'] == text:
+                return frame
+
+    def report(self, name, options, result):
+        latencies = result['latencies']
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\n{name} layer ({options["rooms"]} rooms x {options["clients"]} clients, '
+            f'{options["messages"]} messages per room)'
+        ))
+        self.stdout.write(
+            f'  messages:     {result["sent"]} sent, {result["delivered"]} delivered '
+            f'in {result["elapsed"]:.2f}s'
+        )
+        self.stdout.write(
+            f'  throughput:   {result["sent"] / result["elapsed"]:.1f} messages/s, '
+            f'{result["delivered"] / result["elapsed"]:.1f} deliveries/s'
+        )
+        if latencies:
+            self.stdout.write(
+                f'  round trip:   p50 {statistics.median(latencies):.1f} ms, '
+                f'p95 {percentile(latencies, 0.95):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms'
+            )
+        self.stdout.write(
+            f'  DB queries:   {result["queries_per_message"]:.3f} per message, '
+            f'{result["connect_queries"]:.1f} per connect'
+        )
+
+    def regressions(self, result, options):
+        p95 = percentile(result['latencies'], 0.95)
+        rate = result['sent'] / result['elapsed']
+        if options['max_p95_ms'] is not None and p95 > options['max_p95_ms']:
+            yield f'p95 round trip {p95:.1f} ms > {options["max_p95_ms"]} ms'
+        if options['min_rate'] is not None and rate < options['min_rate']:
+            yield f'{rate:.1f} messages/s < {options["min_rate"]}'
+        limit = options['max_queries_per_message']
+        if limit is not None and result['queries_per_message'] > limit:
+            yield f'{result["queries_per_message"]:.3f} queries per message > {limit}'
@@ -0,0 +1,115 @@
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from writers_app.models import User, Service, ServicePackage, Order
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Create orders from concurrent threads against a throwaway test database and '
+        'report throughput, latency and lock errors. SQLite is measured with its '
+        'default pragmas and with SQLITE_PRAGMAS; PostgreSQL with the configured '
+        'connection settings (set DATABASE_URL to benchmark it)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent writers')
+        parser.add_argument('--orders', type=int, default=200, help='Orders created per thread')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            modes = [('sqlite, default pragmas', {}), ('sqlite, SQLITE_PRAGMAS', None)]
+        else:
+            modes = [(connection.vendor, None)]
+
+        for label, pragmas in modes:
+            overrides = {} if pragmas is None else {'SQLITE_PRAGMAS': pragmas}
+            with override_settings(**overrides):
+                result = self.run_mode(options['threads'], options['orders'])
+            self.report(label, options['threads'], result)
+
+    def run_mode(self, threads, orders_per_thread):
+        old_name = connection.settings_dict['NAME']
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == 'sqlite':
+                # Threads can't share an in-memory test database; use a file
+                connection.settings_dict['TEST']['NAME'] = str(Path(tmp) / 'benchmark.sqlite3')
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                package = self.seed()
+                return self.hammer(package, threads, orders_per_thread)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                connection.settings_dict['TEST']['NAME'] = None
+
+    def seed(self):
+        service = Service.objects.create(
+            name='Benchmark', description='-', short_description='-', icon='fa-star'
+        )
+        return ServicePackage.objects.create(
+            service=service, name='Basic', description='-', price_inr=1, price_usd=1,
+            delivery_days=1, revisions=1,
+        )
+
+    def hammer(self, package, threads, orders_per_thread):
+        latencies, errors = [], []
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(threads)
+
+        def worker(number):
+            from django.db import connection as thread_connection
+            user = User.objects.create_user(f'bench{number}', f'bench{number}@example.com')
+            local_latencies, local_errors = [], []
+            start_barrier.wait()
+            for i in range(orders_per_thread):
+                started = time.perf_counter()
+                try:
+                    # One checkout: the order plus the signal-driven stats rollup updates
+                    with transaction.atomic():
+                        Order.objects.create(
+                            order_number=f'B{number:04d}{i:08d}', user=user, service_package=package,
+                            amount=1, requirements='-', deadline=timezone.now(),
+                        )
+                    local_latencies.append((time.perf_counter() - started) * 1000)
+                except OperationalError as e:
+                    local_errors.append(str(e))
+            thread_connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors.extend(local_errors)
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return latencies, errors, time.perf_counter() - started
+
+    def report(self, label, threads, result):
+        latencies, errors, elapsed = result
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label} ({threads} threads)'))
+        self.stdout.write(f'  orders created: {len(latencies)}, failed: {len(errors)}')
+        self.stdout.write(f'  throughput:     {len(latencies) / elapsed:.1f} orders/s')
+        if latencies:
+            self.stdout.write(
+                f'  latency ms:     p50 {statistics.median(latencies):.1f}, '
+                f'p95 {percentile(latencies, 0.95):.1f}, p99 {percentile(latencies, 0.99):.1f}'
+            )
+        for message in sorted(set(errors)):
+            self.stdout.write(self.style.WARNING(f'  error: {message}'))
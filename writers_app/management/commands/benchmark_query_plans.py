@@ -0,0 +1,137 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from writers_app.models import (
+    User, Service, ServicePackage, Order, ChatMessage,
+    BlogPost, Testimonial, SampleCategory, ResumeSample,
+)
+
+INDEXED_MODELS = [Order, ChatMessage, BlogPost, Testimonial, ResumeSample]
+
+
+def hot_queries(user, order, category):
+    """The querysets behind the hot views, exactly as the views build them"""
+    return [
+        ('IndexView testimonials', Testimonial.objects.filter(is_featured=True, is_approved=True)[:6]),
+        ('IndexView blog posts', BlogPost.objects.filter(is_published=True)[:3]),
+        ('IndexView featured samples', ResumeSample.objects.filter(is_featured=True, is_active=True)[:6]),
+        ('DashboardView orders', Order.objects.filter(user=user).order_by('-created_at')[:20]),
+        ('get_chat_messages', ChatMessage.objects.filter(order=order).order_by('-id')[:51]),
+        ('get_chat_messages after_id', ChatMessage.objects.filter(order=order, id__gt=0).order_by('id')[:51]),
+        ('TestimonialsView page', Testimonial.objects.filter(is_approved=True).order_by('-created_at', '-id')[:13]),
+        ('BlogListView page', BlogPost.objects.filter(
+            is_published=True, published_at__isnull=False).order_by('-published_at', '-id')[:10]),
+        ('SamplesView category', ResumeSample.objects.filter(category=category, is_active=True).order_by(
+            '-is_featured', '-created_at', '-id')[:13]),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and compare query plans and timings of the '
+        'hot view queries with and without the composite indexes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Rows to seed per large table')
+        parser.add_argument('--repeat', type=int, default=20, help='Executions per query when timing')
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        # Never touch the real database: build a fresh, fully migrated test database
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            fixtures = self.seed(options['rows'])
+            queries = hot_queries(*fixtures)
+
+            with connection.schema_editor() as editor:
+                for model in INDEXED_MODELS:
+                    for index in model._meta.indexes:
+                        editor.remove_index(model, index)
+            before = self.measure(queries, options['repeat'])
+
+            with connection.schema_editor() as editor:
+                for model in INDEXED_MODELS:
+                    for index in model._meta.indexes:
+                        editor.add_index(model, index)
+            after = self.measure(queries, options['repeat'])
+
+            self.report(queries, before, after)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, rows):
+        self.stdout.write(f'Seeding {rows} rows per table...')
+        now = timezone.now()
+        users = User.objects.bulk_create([
+            User(username=f'bench{i}', email=f'bench{i}@example.com') for i in range(max(rows // 50, 1))
+        ])
+        service = Service.objects.create(
+            name='Benchmark', description='-', short_description='-', icon='fa-star'
+        )
+        package = ServicePackage.objects.create(
+            service=service, name='Basic', description='-', price_inr=1, price_usd=1,
+            delivery_days=1, revisions=1,
+        )
+        orders = Order.objects.bulk_create([
+            Order(
+                order_number=f'BENCH{i:010d}', user=users[i % len(users)], service_package=package,
+                amount=1, requirements='-', deadline=now,
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        ChatMessage.objects.bulk_create([
+            ChatMessage(order=orders[i % len(orders)], user=users[i % len(users)], message='-')
+            for i in range(rows)
+        ], batch_size=1000)
+        Testimonial.objects.bulk_create([
+            Testimonial(user=users[i % len(users)], content='-', is_approved=i % 3 == 0, is_featured=i % 50 == 0)
+            for i in range(rows)
+        ], batch_size=1000)
+        BlogPost.objects.bulk_create([
+            BlogPost(
+                title=f'Post {i}', slug=f'bench-post-{i}', author=users[0], content='-', excerpt='-',
+                is_published=i % 4 != 0, published_at=now - timedelta(hours=i),
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        categories = SampleCategory.objects.bulk_create([
+            SampleCategory(name=f'Category {i}', slug=f'bench-category-{i}', order=i) for i in range(20)
+        ])
+        ResumeSample.objects.bulk_create([
+            ResumeSample(
+                title=f'Sample {i}', category=categories[i % len(categories)], image='samples/bench.png',
+                is_featured=i % 40 == 0, is_active=i % 10 != 0,
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        return users[0], orders[0], categories[0]
+
+    def measure(self, queries, repeat):
+        # Refresh planner statistics for the current set of indexes
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        results = []
+        for label, queryset in queries:
+            plan = queryset.explain()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+            results.append((plan, elapsed_ms))
+        return results
+
+    def report(self, queries, before, after):
+        for (label, _), (plan_before, ms_before), (plan_after, ms_after) in zip(queries, before, after):
+            speedup = ms_before / ms_after if ms_after else float('inf')
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'\n{label}: {ms_before:.2f} ms -> {ms_after:.2f} ms ({speedup:.1f}x)'
+            ))
+            self.stdout.write('  before:')
+            self.stdout.write('    ' + plan_before.replace('\n', '\n    '))
+            self.stdout.write('  after:')
+            self.stdout.write('    ' + plan_after.replace('\n', '\n    '))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from writers_app.cache import cache_stats, reset_cache_stats
+
+CACHED_BLOCKS = ['homepage', 'samples', 'pricing', 'navigation']
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters for the cached view blocks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        for name in CACHED_BLOCKS:
+            stats = cache_stats(name)
+            self.stdout.write(
+                f"{name}: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_ratio']:.1%} hit ratio)"
+            )
+            if options['reset']:
+                reset_cache_stats(name)
@@ -0,0 +1,71 @@
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+# Content pages that only change on deploy (the PageCacheMixin views)
+STATIC_PAGES = [
+    'about',
+    'privacy',
+    'terms',
+    'refund',
+    'linkedin_service',
+    'visual_cv_service',
+    'infographic_cv_service',
+    'job_hunt_service',
+    'sop_service',
+    'lor_service',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the marketing pages to static HTML for WhiteNoise or a front proxy to serve. '
+        'Pages are rendered for an anonymous visitor, so signed-in users see the signed-out '
+        'navbar on them: only list pages in STATIC_PAGES that nobody needs to be signed in for. '
+        'Forms on them fetch a CSRF token from /api/csrf/ before posting, which needs main.js'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(settings.STATIC_EXPORT_ROOT),
+                            help='Directory to write the pages to')
+        parser.add_argument('--host', default=settings.STATIC_EXPORT_HOST,
+                            help='Host name the pages are served from (used for absolute URLs)')
+        parser.add_argument('--insecure', action='store_true', help='Render http:// instead of https:// URLs')
+        parser.add_argument('--clear', action='store_true', help='Remove previously exported pages first')
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        if options['clear'] and output.exists():
+            shutil.rmtree(output)
+
+        if settings.DEBUG or not isinstance(staticfiles_storage, ManifestFilesMixin):
+            self.stderr.write(self.style.WARNING(
+                'Asset URLs will not be hashed: run with DEBUG off and STATIC_EXPORT_ENABLED '
+                'set (manifest storage), after collectstatic.'
+            ))
+
+        factory = RequestFactory()
+        for name in STATIC_PAGES:
+            path = reverse(name)
+            request = factory.get(path, secure=not options['insecure'], HTTP_HOST=options['host'])
+            request.user = AnonymousUser()
+
+            match = resolve(path)
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            if response.status_code != 200:
+                raise CommandError(f'{path} returned {response.status_code}')
+
+            target = output / path.strip('/') / 'index.html'
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(response.content)
+            self.stdout.write(f'{path} -> {target}')
+
+        self.stdout.write(self.style.SUCCESS(f'Exported {len(STATIC_PAGES)} pages to {output}'))
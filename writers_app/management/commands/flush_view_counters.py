@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from writers_app.counters import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = 'Write buffered BlogPost/ResumeSample view counts to the database'
+
+    def handle(self, *args, **options):
+        rows = flush_view_counts()
+        self.stdout.write(self.style.SUCCESS(f'Flushed view counts for {rows} rows'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from writers_app.stats import recompute_admin_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the admin stats rollup from the orders and users tables. Run it '
+        'periodically (e.g. nightly from cron) to correct drift from bulk updates '
+        'that bypass the model signals'
+    )
+
+    def handle(self, *args, **options):
+        rows = recompute_admin_stats()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed {rows} admin stats rows'))
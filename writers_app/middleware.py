@@ -0,0 +1,97 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import Resolver404, resolve
+
+from .cache import get_cached_page, build_page_response, store_page, page_cacheable_host
+from .routers import replica_configured, start_request, end_request, wrote_to_primary
+
+
+@lru_cache(maxsize=1024)
+def serves_cached_pages(path_info):
+    """Whether the path resolves to a PageCacheMixin view; nothing else is ever stored"""
+    try:
+        match = resolve(path_info)
+    except Resolver404:
+        return False
+    return getattr(getattr(match.func, 'view_class', None), 'page_cache', False)
+
+
+class PageCacheMiddleware:
+    """
+    Serve anonymous visitors' marketing pages straight from the page cache.
+
+    Install above SessionMiddleware. A request without a session or messages
+    cookie can't belong to a logged-in user, so a cached copy is returned
+    before the session store, auth lookup or template engine are touched.
+    Pages are stored here on the way out, once every inner middleware has
+    added its headers; views opt in through PageCacheMixin, and only their
+    paths on a PAGE_CACHE_HOSTS host are looked up, so admin, API, static
+    and 404 requests never cost a cache round trip.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if self.can_serve(request):
+            page = get_cached_page(request)
+            if page is not None:
+                # Run the CSRF middleware around the cached page so the visitor
+                # gets a valid token and cookie without reaching the view
+                csrf = CsrfViewMiddleware(lambda req: build_page_response(req, page))
+                return csrf(request)
+
+        response = self.get_response(request)
+
+        content = getattr(response, 'page_cache_content', None)
+        if content is not None and response.status_code == 200:
+            store_page(request, response, content)
+            response.headers['X-Page-Cache'] = 'miss'
+        return response
+
+    def can_serve(self, request):
+        return (
+            settings.PAGE_CACHE_ENABLED
+            and request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and CookieStorage.cookie_name not in request.COOKIES
+            and serves_cached_pages(request.path_info)
+            and page_cacheable_host(request)
+        )
+
+
+class ReplicaPinningMiddleware:
+    """
+    Track database writes per request for ReplicaRouter.
+
+    Install above SessionMiddleware so session saves count as writes. A
+    response to a request that wrote sets a short-lived cookie; while it
+    is present the visitor's reads stay on the primary, so they see their
+    own order, comment or profile change before the replica catches up.
+    """
+
+    cookie_name = 'db_primary_pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        token = start_request(pinned=self.cookie_name in request.COOKIES)
+        try:
+            response = self.get_response(request)
+            if wrote_to_primary():
+                response.set_cookie(
+                    self.cookie_name, '1',
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                    samesite='Lax',
+                )
+        finally:
+            end_request(token)
+        return response
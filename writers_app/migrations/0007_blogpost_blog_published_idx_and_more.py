@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-17 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('writers_app', '0006_remove_resumesample_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-published_at', '-created_at'], name='blog_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['order', 'created_at'], name='chat_order_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at'], name='order_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumesample',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-is_featured', '-created_at', '-id'], name='sample_category_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumesample',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-is_featured', '-created_at'], name='sample_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-created_at'], name='testimonial_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_approved', True), ('is_featured', True)), fields=['-created_at'], name='testimonial_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-17 21:01
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_admin_stats(apps, schema_editor):
+    """Seed the rollup from the existing orders and users"""
+    AdminStat = apps.get_model('writers_app', 'AdminStat')
+    Order = apps.get_model('writers_app', 'Order')
+    User = apps.get_model('writers_app', 'User')
+
+    stats = [
+        AdminStat(name='users', key='', count=User.objects.count()),
+        AdminStat(name='orders', key='', count=Order.objects.count()),
+    ]
+    for field, name in (('status', 'order_status'), ('payment_status', 'payment_status')):
+        for row in Order.objects.order_by().values(field).annotate(count=Count('id')):
+            stats.append(AdminStat(name=name, key=row[field], count=row['count']))
+
+    paid = Order.objects.filter(payment_status='paid').order_by()
+    totals = paid.aggregate(count=Count('id'), amount=Sum('amount'))
+    stats.append(AdminStat(name='revenue', key='', count=totals['count'], amount=totals['amount'] or 0))
+    for row in paid.annotate(day=TruncDate('created_at')).values('day').annotate(
+        count=Count('id'), amount=Sum('amount')
+    ):
+        stats.append(AdminStat(
+            name='daily_revenue', key=row['day'].isoformat(), count=row['count'], amount=row['amount']
+        ))
+    AdminStat.objects.bulk_create(stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('writers_app', '0007_blogpost_blog_published_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('orders', 'Orders'), ('order_status', 'Orders by status'), ('payment_status', 'Orders by payment status'), ('users', 'Users'), ('revenue', 'Revenue'), ('daily_revenue', 'Revenue per day')], max_length=20)),
+                ('key', models.CharField(blank=True, help_text='Status, or ISO date for daily revenue', max_length=20)),
+                ('count', models.BigIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='adminstat',
+            constraint=models.UniqueConstraint(fields=('name', 'key'), name='admin_stat_name_key_uniq'),
+        ),
+        migrations.RunPython(populate_admin_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-17 21:09
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_published_at(apps, schema_editor):
+    """Published posts without a publish date sort by when they were written"""
+    BlogPost = apps.get_model('writers_app', 'BlogPost')
+    BlogPost.objects.filter(is_published=True, published_at__isnull=True).update(published_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('writers_app', '0009_archivedorder'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='testimonial',
+            name='testimonial_approved_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-published_at', '-id'], name='blog_published_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-created_at', '-id'], name='testimonial_approved_idx'),
+        ),
+    ]
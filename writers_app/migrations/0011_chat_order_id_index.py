@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-17 21:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('writers_app', '0010_keyset_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='chatmessage',
+            name='chat_order_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['order', 'id'], name='chat_order_id_idx'),
+        ),
+    ]
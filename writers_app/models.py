@@ -187,6 +187,10 @@ class Order(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # DashboardView: a user's orders, newest first
+            models.Index(fields=['user', '-created_at'], name='order_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"Order {self.order_number} - {self.user.get_full_name()}"
@@ -211,6 +215,11 @@ class ChatMessage(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # get_chat_messages, ChatConsumer sync and ChatView page an
+            # order's conversation by id (ids follow send order)
+            models.Index(fields=['order', 'id'], name='chat_order_id_idx'),
+        ]
 
     def __str__(self):
         return f"Message from {self.user.get_full_name()} - {self.created_at}"
@@ -235,10 +244,30 @@ class BlogPost(models.Model):
 
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # BlogListView and the homepage: published posts, newest first
+            models.Index(
+                fields=['-published_at', '-created_at'],
+                condition=models.Q(is_published=True),
+                name='blog_published_idx',
+            ),
+            # BlogListView's keyset pagination on (published_at, id)
+            models.Index(
+                fields=['-published_at', '-id'],
+                condition=models.Q(is_published=True),
+                name='blog_published_keyset_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # The blog list pages through posts by published_at, so every published post needs one
+        if self.is_published and self.published_at is None:
+            self.published_at = timezone.now()
+        super().save(*args, **kwargs)
+
 
 class Testimonial(models.Model):
     """Customer testimonials and reviews"""
@@ -256,6 +285,20 @@ class Testimonial(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # TestimonialsView: approved testimonials, newest first, keyset paginated on (created_at, id)
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_approved=True),
+                name='testimonial_approved_idx',
+            ),
+            # IndexView / ServiceDetailView: featured approved testimonials
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_approved=True, is_featured=True),
+                name='testimonial_featured_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Testimonial by {self.user.get_full_name()}"
@@ -362,7 +405,85 @@ class ResumeSample(models.Model):
 
     class Meta:
         ordering = ['-is_featured', '-created_at']
+        indexes = [
+            # SamplesView and the samples API: a category's active samples in keyset order
+            models.Index(
+                fields=['category', '-is_featured', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='sample_category_active_idx',
+            ),
+            # IndexView: featured active samples, in the model's default ordering
+            models.Index(
+                fields=['-is_featured', '-created_at'],
+                condition=models.Q(is_featured=True, is_active=True),
+                name='sample_featured_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.category.name})"
     
+
+class ArchivedOrder(models.Model):
+    """
+    A completed or cancelled order moved out of the hot tables (see archive.py).
+
+    The columns needed to list and count archived orders are kept as fields;
+    the full order and its chat history are stored as compressed JSON.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    order_number = models.CharField(max_length=20, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_orders')
+    service_name = models.CharField(max_length=200)
+    package_name = models.CharField(max_length=200)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    payment_status = models.CharField(max_length=20, choices=Order.PAYMENT_STATUS_CHOICES)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    message_count = models.IntegerField(default=0)
+    payload = models.BinaryField(help_text="zlib-compressed JSON of the order and its chat messages")
+    created_at = models.DateTimeField(help_text="When the original order was placed")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The customer's archive list
+            models.Index(fields=['user', '-created_at'], name='archived_order_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order {self.order_number}"
+
+
+class AdminStat(models.Model):
+    """Precomputed admin dashboard totals, kept current by signals (see stats.py)"""
+    ORDERS = 'orders'
+    ORDER_STATUS = 'order_status'
+    PAYMENT_STATUS = 'payment_status'
+    USERS = 'users'
+    REVENUE = 'revenue'
+    DAILY_REVENUE = 'daily_revenue'
+
+    NAME_CHOICES = [
+        (ORDERS, 'Orders'),
+        (ORDER_STATUS, 'Orders by status'),
+        (PAYMENT_STATUS, 'Orders by payment status'),
+        (USERS, 'Users'),
+        (REVENUE, 'Revenue'),
+        (DAILY_REVENUE, 'Revenue per day'),
+    ]
+
+    name = models.CharField(max_length=20, choices=NAME_CHOICES)
+    key = models.CharField(max_length=20, blank=True, help_text="Status, or ISO date for daily revenue")
+    count = models.BigIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'key'], name='admin_stat_name_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.name}[{self.key}] = {self.count}"
@@ -0,0 +1,88 @@
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded for the ordering"""
+
+
+def _field_names(ordering):
+    return [name.lstrip('-') for name in ordering]
+
+
+def encode_cursor(obj, ordering):
+    """Encode the ordering values of obj as an opaque URL-safe cursor"""
+    values = []
+    for name in _field_names(ordering):
+        value = getattr(obj, name)
+        # isoformat() keeps microseconds, which DjangoJSONEncoder drops
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Decode a cursor back into typed values for the ordering fields"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor')
+
+    names = _field_names(ordering)
+    if not isinstance(values, list) or len(values) != len(names):
+        raise InvalidCursor('Cursor does not match the ordering')
+
+    try:
+        return [
+            model._meta.get_field('id' if name == 'pk' else name).to_python(value)
+            for name, value in zip(names, values)
+        ]
+    except (FieldDoesNotExist, ValidationError):
+        raise InvalidCursor('Cursor does not match the ordering')
+
+
+def keyset_filter(ordering, values):
+    """
+    Build the WHERE clause selecting rows that sort after the cursor values.
+
+    For ordering (-a, -b, -c) and values (A, B, C) this is
+    a < A OR (a = A AND b < B) OR (a = A AND b = B AND c < C).
+    The last ordering field must be unique so the order is total.
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def split_page(objects, ordering, limit):
+    """Trim an over-fetched (limit + 1) row list into (page, next_cursor)"""
+    if len(objects) > limit:
+        return objects[:limit], encode_cursor(objects[limit - 1], ordering)
+    return objects, None
+
+
+def keyset_page(queryset, ordering, cursor=None, limit=20):
+    """Return (objects, next_cursor) for the page of queryset after cursor"""
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+    return split_page(list(queryset[:limit + 1]), ordering, limit)
+
+
+def parse_limit(value, default, maximum):
+    """Clamp a ?limit= query parameter to 1..maximum"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, maximum))
@@ -0,0 +1,68 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .cache import PRICING_MATRIX_KEY, get_or_build
+from .tiered_cache import tiered_cache
+from .models import Service, ServicePackage
+
+# Rebuilt from model signals, so the timeout is only a safety net
+PRICING_MATRIX_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def build_pricing_matrix():
+    """Denormalize active services x active packages into plain dicts"""
+    active_packages = ServicePackage.objects.filter(is_active=True).order_by('display_order', 'price_inr')
+    services = Service.objects.filter(is_active=True).prefetch_related(
+        Prefetch('packages', queryset=active_packages, to_attr='active_packages')
+    )
+
+    matrix = []
+    timestamps = []
+    for service in services:
+        timestamps.append(service.updated_at)
+        packages = []
+        for package in service.active_packages:
+            timestamps.append(package.updated_at)
+            packages.append({
+                'id': package.id,
+                'name': package.name,
+                'description': package.description,
+                'price_inr': package.get_price('INR'),
+                'price_usd': package.get_price('USD'),
+                'features': package.features,
+                'delivery_days': package.delivery_days,
+                'revisions': package.revisions,
+                'is_popular': package.is_popular,
+            })
+        matrix.append({
+            'id': service.id,
+            'name': service.name,
+            'slug': service.slug,
+            'short_description': service.short_description,
+            'icon': service.icon,
+            'packages': packages,
+        })
+
+    # A content digest catches deletes and deactivations that don't move updated_at
+    digest = hashlib.md5(json.dumps(matrix, cls=DjangoJSONEncoder).encode()).hexdigest()
+    return {
+        'services': matrix,
+        'last_modified': max(timestamps, default=None),
+        'digest': digest,
+    }
+
+
+def get_pricing_matrix():
+    return get_or_build(
+        PRICING_MATRIX_KEY,
+        build_pricing_matrix,
+        timeout=PRICING_MATRIX_TIMEOUT,
+        stats_name='pricing',
+    )
+
+
+def rebuild_pricing_matrix():
+    tiered_cache.set(PRICING_MATRIX_KEY, build_pricing_matrix(), PRICING_MATRIX_TIMEOUT)
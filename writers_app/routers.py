@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+
+
+class RoutingState:
+    """
+    Per-request routing flags: whether reads may use the replica, whether
+    the visitor is pinned to the primary by a recent write (the cookie),
+    and whether this request itself wrote
+    """
+
+    def __init__(self, pinned=False):
+        self.replica_reads = False
+        self.pinned = pinned
+        self.wrote = False
+
+
+_state = ContextVar('writers_app_db_routing', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def start_request(pinned=False):
+    """Give the current request its own routing state; returns a token for end_request()"""
+    return _state.set(RoutingState(pinned))
+
+
+def end_request(token):
+    _state.reset(token)
+
+
+def wrote_to_primary():
+    """Whether the current request wrote, as opposed to only arriving pinned"""
+    state = _state.get()
+    return state is not None and state.wrote
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads in this block to the replica, unless the request has already written"""
+    state = _state.get()
+    token = None
+    if state is None:
+        state = RoutingState()
+        token = _state.set(state)
+    previous, state.replica_reads = state.replica_reads, True
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+        if token is not None:
+            _state.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Route reads in this block to the primary, even inside read_from_replica().
+
+    Used while building values for the shared cache: a block built from a
+    lagging replica right after a write has invalidated it would be cached,
+    stale, for its whole timeout.
+    """
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    previous, state.replica_reads = state.replica_reads, False
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+
+
+class ReplicaRouter:
+    """
+    Send writes to the primary and opted-in reads to the replica.
+
+    Reads only go to the replica inside read_from_replica(), which the
+    public read-only views enter through ReplicaReadMixin. Once a request
+    writes, its remaining reads stay on the primary, and
+    ReplicaPinningMiddleware keeps the visitor's next requests there for
+    REPLICA_PIN_SECONDS so they see their own writes despite replication lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.replica_reads
+            or state.pinned
+            or state.wrote
+            or not replica_configured()
+            # Reads inside a transaction must see its uncommitted writes
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema by replicating (or copying) the primary
+        return db != REPLICA_DB_ALIAS
@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .cache import (
+    HOMEPAGE_CONTEXT_KEY, SAMPLES_CONTEXT_KEY, NAV_SERVICES_KEY, TESTIMONIAL_COUNT_KEY, BLOG_POST_COUNT_KEY,
+    invalidate, expire_cached_pages, user_cache_key,
+)
+from .models import AdminStat, ArchivedOrder, User, Order, Testimonial, BlogPost, Service, ServicePackage, ResumeSample, SampleCategory
+from .pricing import rebuild_pricing_matrix
+from .stats import apply_deltas, apply_order_change, order_snapshot, order_stats_preserved
+
+# Saves that only touch these fields don't change anything a cached page shows
+COUNTER_FIELDS = frozenset({'view_count'})
+
+# Order fields the admin stats rollup is derived from
+STATS_FIELDS = frozenset({'status', 'payment_status', 'amount'})
+
+# Cached blocks to drop whenever an instance of the model is saved or deleted
+DEPENDENT_CACHE_KEYS = {
+    # Covers approval/publishing, which changes the paginated lists' cached totals
+    Testimonial: [HOMEPAGE_CONTEXT_KEY, TESTIMONIAL_COUNT_KEY],
+    BlogPost: [HOMEPAGE_CONTEXT_KEY, BLOG_POST_COUNT_KEY],
+    Service: [HOMEPAGE_CONTEXT_KEY, NAV_SERVICES_KEY],
+    ResumeSample: [HOMEPAGE_CONTEXT_KEY, SAMPLES_CONTEXT_KEY],
+    SampleCategory: [HOMEPAGE_CONTEXT_KEY, SAMPLES_CONTEXT_KEY],
+}
+
+
+def _is_counter_update(kwargs):
+    update_fields = kwargs.get('update_fields')
+    return bool(update_fields) and set(update_fields) <= COUNTER_FIELDS
+
+
+def invalidate_cached_context(sender, **kwargs):
+    """Clear the cached view context that depends on the changed model, once the change is committed"""
+    if _is_counter_update(kwargs):
+        return
+    # Invalidating before commit lets a concurrent request rebuild the
+    # block from the old rows and cache them for the whole timeout
+    keys = DEPENDENT_CACHE_KEYS[sender]
+    transaction.on_commit(lambda: invalidate(*keys))
+
+
+for model in DEPENDENT_CACHE_KEYS:
+    post_save.connect(invalidate_cached_context, sender=model)
+    post_delete.connect(invalidate_cached_context, sender=model)
+
+
+def expire_pages_on_navigation_change(sender, **kwargs):
+    """Every cached page embeds the service menu, so a Service change expires them all"""
+    transaction.on_commit(expire_cached_pages)
+
+
+post_save.connect(expire_pages_on_navigation_change, sender=Service)
+post_delete.connect(expire_pages_on_navigation_change, sender=Service)
+
+
+def refresh_pricing_matrix(sender, **kwargs):
+    """Rebuild the pricing matrix once the pricing change is committed"""
+    transaction.on_commit(rebuild_pricing_matrix)
+
+
+for model in (Service, ServicePackage):
+    post_save.connect(refresh_pricing_matrix, sender=model)
+    post_delete.connect(refresh_pricing_matrix, sender=model)
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the user cached by CachedModelBackend so the next request reloads it"""
+    key = user_cache_key(instance.pk)
+    transaction.on_commit(lambda: invalidate(key))
+
+
+post_save.connect(invalidate_cached_user, sender=User)
+post_delete.connect(invalidate_cached_user, sender=User)
+
+
+def remember_order_stats(sender, instance, **kwargs):
+    """Load the order's stored values before it is overwritten, for the rollup delta"""
+    instance._stats_previous = None
+    if instance._state.adding:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and not set(update_fields) & STATS_FIELDS:
+        instance._stats_previous = order_snapshot(instance)
+        return
+    instance._stats_previous = Order.objects.filter(pk=instance.pk).values_list(
+        'status', 'payment_status', 'amount', 'created_at'
+    ).first()
+
+
+def update_order_stats(sender, instance, **kwargs):
+    apply_order_change(getattr(instance, '_stats_previous', None), order_snapshot(instance))
+
+
+def remove_order_stats(sender, instance, **kwargs):
+    if order_stats_preserved():
+        return
+    apply_order_change(order_snapshot(instance), None)
+
+
+pre_save.connect(remember_order_stats, sender=Order)
+post_save.connect(update_order_stats, sender=Order)
+post_delete.connect(remove_order_stats, sender=Order)
+# Archived orders still count, until they are deleted (e.g. with their user)
+post_delete.connect(remove_order_stats, sender=ArchivedOrder)
+
+
+def update_user_stats(sender, instance, created=False, **kwargs):
+    if created:
+        apply_deltas({(AdminStat.USERS, ''): (1, 0)})
+
+
+def remove_user_stats(sender, instance, **kwargs):
+    apply_deltas({(AdminStat.USERS, ''): (-1, 0)})
+
+
+post_save.connect(update_user_stats, sender=User)
+post_delete.connect(remove_user_stats, sender=User)
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+connection_created.connect(configure_sqlite_connection)
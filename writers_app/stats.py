@@ -0,0 +1,157 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AdminStat, ArchivedOrder, Order, User
+
+_preserve_order_stats = ContextVar('writers_app_preserve_order_stats', default=False)
+
+
+@contextmanager
+def preserve_order_stats():
+    """Orders deleted in this block stay in the rollup, e.g. because they moved to the archive"""
+    token = _preserve_order_stats.set(True)
+    try:
+        yield
+    finally:
+        _preserve_order_stats.reset(token)
+
+
+def order_stats_preserved():
+    return _preserve_order_stats.get()
+
+
+def order_contribution(status, payment_status, amount, created_at):
+    """The (name, key) -> (count, amount) rows a single order adds to the rollup"""
+    rows = {
+        (AdminStat.ORDERS, ''): (1, Decimal(0)),
+        (AdminStat.ORDER_STATUS, status): (1, Decimal(0)),
+        (AdminStat.PAYMENT_STATUS, payment_status): (1, Decimal(0)),
+    }
+    if payment_status == 'paid':
+        amount = Decimal(str(amount or 0))
+        rows[(AdminStat.REVENUE, '')] = (1, amount)
+        rows[(AdminStat.DAILY_REVENUE, timezone.localdate(created_at).isoformat())] = (1, amount)
+    return rows
+
+
+def order_snapshot(order):
+    """The fields of an order that the rollup depends on, as last saved"""
+    return (order.status, order.payment_status, order.amount, order.created_at)
+
+
+def apply_order_change(old, new):
+    """Move an order's contribution from the old snapshot to the new one (either may be None)"""
+    counts, amounts = Counter(), Counter()
+    for snapshot, sign in ((old, -1), (new, 1)):
+        if snapshot is None:
+            continue
+        for row, (count, amount) in order_contribution(*snapshot).items():
+            counts[row] += sign * count
+            amounts[row] += sign * amount
+    apply_deltas({row: (counts[row], amounts[row]) for row in counts})
+
+
+def apply_deltas(deltas):
+    """Add the deltas to their rollup rows with F() updates, creating missing rows"""
+    now = timezone.now()
+    for (name, key), (count, amount) in deltas.items():
+        if not count and not amount:
+            continue
+        rollup = AdminStat.objects.filter(name=name, key=key)
+        changes = {'count': F('count') + count, 'amount': F('amount') + amount, 'updated_at': now}
+        if rollup.update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                AdminStat.objects.create(name=name, key=key, count=count, amount=amount)
+        except IntegrityError:
+            # Another request created the row first
+            rollup.update(**changes)
+
+
+def compute_admin_stats():
+    """Aggregate every rollup row from scratch, counting live and archived orders"""
+    counts, amounts = Counter(), Counter()
+
+    def add(name, key, count, amount=0):
+        counts[(name, key)] += count
+        amounts[(name, key)] += Decimal(amount or 0)
+
+    add(AdminStat.USERS, '', User.objects.count())
+    for orders in (Order.objects.order_by(), ArchivedOrder.objects.order_by()):
+        add(AdminStat.ORDERS, '', orders.count())
+        for field, name in (('status', AdminStat.ORDER_STATUS), ('payment_status', AdminStat.PAYMENT_STATUS)):
+            for row in orders.values(field).annotate(count=Count('id')):
+                add(name, row[field], row['count'])
+
+        paid = orders.filter(payment_status='paid')
+        totals = paid.aggregate(count=Count('id'), amount=Sum('amount'))
+        add(AdminStat.REVENUE, '', totals['count'], totals['amount'])
+        for row in paid.annotate(day=TruncDate('created_at')).values('day').annotate(
+            count=Count('id'), amount=Sum('amount')
+        ):
+            add(AdminStat.DAILY_REVENUE, row['day'].isoformat(), row['count'], row['amount'])
+    return {row: (counts[row], amounts[row]) for row in counts}
+
+
+def recompute_admin_stats():
+    """Replace the rollup with a full recompute, correcting any drift; returns the row count"""
+    rows = compute_admin_stats()
+    with transaction.atomic():
+        AdminStat.objects.all().delete()
+        AdminStat.objects.bulk_create([
+            AdminStat(name=name, key=key, count=count, amount=amount)
+            for (name, key), (count, amount) in rows.items()
+        ])
+    return len(rows)
+
+
+def get_admin_stats(days=None):
+    """Read the admin dashboard figures from the rollup in one query"""
+    days = days or settings.ADMIN_STATS_REVENUE_DAYS
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    rollup = {
+        (stat.name, stat.key): stat
+        for stat in AdminStat.objects.exclude(name=AdminStat.DAILY_REVENUE, key__lt=first_day.isoformat())
+    }
+
+    def count(name, key=''):
+        stat = rollup.get((name, key))
+        return stat.count if stat else 0
+
+    def amount(name, key=''):
+        stat = rollup.get((name, key))
+        return stat.amount if stat else Decimal(0)
+
+    daily_revenue = []
+    for offset in range(days):
+        day = (first_day + timedelta(days=offset)).isoformat()
+        daily_revenue.append({
+            'date': day,
+            'orders': count(AdminStat.DAILY_REVENUE, day),
+            'amount': amount(AdminStat.DAILY_REVENUE, day),
+        })
+
+    return {
+        'total_orders': count(AdminStat.ORDERS),
+        'total_users': count(AdminStat.USERS),
+        'orders_by_status': {
+            status: count(AdminStat.ORDER_STATUS, status) for status, label in Order.STATUS_CHOICES
+        },
+        'payments_by_status': {
+            status: count(AdminStat.PAYMENT_STATUS, status) for status, label in Order.PAYMENT_STATUS_CHOICES
+        },
+        'total_revenue': amount(AdminStat.REVENUE),
+        'period_revenue': sum((day['amount'] for day in daily_revenue), Decimal(0)),
+        'daily_revenue': daily_revenue,
+    }
@@ -0,0 +1,693 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from asgiref.testing import ApplicationCommunicator
+from channels.routing import URLRouter
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import QuerySet
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import counters
+from .admin import EstimatedCountPaginator
+from .archive import archive_orders
+from .cache import get_or_build
+from .chat_buffer import ChatMessageBuffer, chat_group_name
+from .counters import MemoryCounterStore, flush_view_counts, record_view
+from .middleware import ReplicaPinningMiddleware
+from .models import (
+    AdminStat, BlogPost, ChatMessage, NewsletterSubscriber, Order, ResumeSample, SampleCategory, Service,
+    ServicePackage, Testimonial, User,
+)
+from .pagination import InvalidCursor, decode_cursor, keyset_page, parse_limit
+from .routing import websocket_urlpatterns
+from .stats import compute_admin_stats, get_admin_stats, recompute_admin_stats
+from .tiered_cache import TwoTierCache, tiered_cache
+from .views import SAMPLE_ORDERING, ServiceDetailView
+
+
+def clear_caches():
+    cache.clear()
+    tiered_cache.local.clear()
+
+
+def create_order(user, order_number='T00000001', **fields):
+    service, _ = Service.objects.get_or_create(
+        name='Resume Writing', defaults={'description': '-', 'short_description': '-', 'icon': 'fa-file-alt'},
+    )
+    package, _ = ServicePackage.objects.get_or_create(
+        service=service, name='Basic',
+        defaults={'description': '-', 'price_inr': 100, 'price_usd': 2, 'delivery_days': 1, 'revisions': 1},
+    )
+    fields = {'amount': 100, 'requirements': '-', 'deadline': timezone.now(), **fields}
+    return Order.objects.create(order_number=order_number, user=user, service_package=package, **fields)
+
+
+class SamplesViewQueryTests(TestCase):
+    """The samples page costs the same number of queries however many categories exist"""
+
+    COLD_QUERIES = 3
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def create_categories(self, count, samples_per_category=3):
+        for number in range(count):
+            category = SampleCategory.objects.create(name=f'Category {number}', slug=f'category-{number}', order=number)
+            for sample in range(samples_per_category):
+                ResumeSample.objects.create(title=f'Sample {number}.{sample}', category=category, image='samples/x.png')
+
+    def get_samples(self):
+        response = self.client.get(reverse('samples'))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_fixed_queries(self):
+        clear_caches()
+        # Cold: the nav menu, the categories and one prefetch of their samples
+        with self.assertNumQueries(self.COLD_QUERIES):
+            self.get_samples()
+        # Warm: everything comes from the cache
+        with self.assertNumQueries(0):
+            self.get_samples()
+
+    def test_one_category(self):
+        self.create_categories(1)
+        self.assert_fixed_queries()
+
+    def test_many_categories(self):
+        self.create_categories(10)
+        self.assert_fixed_queries()
+
+    def test_every_category_is_rendered(self):
+        self.create_categories(4)
+        response = self.get_samples()
+        self.assertEqual(len(response.context['samples_by_category']), 4)
+        for samples in response.context['samples_by_category'].values():
+            self.assertEqual(len(samples), 3)
+
+
+class SingleFlightTests(SimpleTestCase):
+    """A cache miss under concurrency runs the builder once, within and across workers"""
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def slow_builder(self):
+        with self.calls_lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return {'built': True}
+
+    def race(self, caches, threads_per_cache=8):
+        results = []
+        start = threading.Barrier(len(caches) * threads_per_cache)
+
+        def fetch(tiered):
+            start.wait()
+            results.append(tiered.get_or_set('writers_app:test_single_flight', self.slow_builder, 60))
+
+        threads = [
+            threading.Thread(target=fetch, args=(tiered,))
+            for tiered in caches for _ in range(threads_per_cache)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_threads_in_one_worker_build_once(self):
+        results = self.race([TwoTierCache(shared=cache)])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([value for value, hit in results], [{'built': True}] * len(results))
+        self.assertEqual(sum(not hit for value, hit in results), 1)
+
+    def test_workers_sharing_a_cache_build_once(self):
+        # Each TwoTierCache stands in for a worker process with its own local tier
+        workers = [TwoTierCache(shared=cache, poll_interval=0.01) for _ in range(4)]
+        results = self.race(workers, threads_per_cache=4)
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(value == {'built': True} for value, hit in results))
+
+    def test_get_or_build_serves_hits_without_building(self):
+        get_or_build('writers_app:test_single_flight', self.slow_builder)
+        get_or_build('writers_app:test_single_flight', self.slow_builder)
+        self.assertEqual(self.calls, 1)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, PAGE_CACHE_HOSTS=['testserver'])
+class PageCacheTests(TestCase):
+    """Only PageCacheMixin paths on a configured host touch the page cache"""
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_cached_page_is_served_on_repeat(self):
+        first = self.client.get(reverse('about'))
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+        second = self.client.get(reverse('about'))
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+
+    def test_other_paths_skip_the_lookup(self):
+        with mock.patch('writers_app.middleware.get_cached_page') as lookup:
+            self.client.get('/admin/login/')
+            self.client.get('/no-such-page/')
+            self.client.get(reverse('faq'))
+        lookup.assert_not_called()
+
+    def test_unknown_host_is_not_cached(self):
+        with override_settings(ALLOWED_HOSTS=['*']):
+            response = self.client.get(reverse('about'), HTTP_HOST='attacker.example')
+            self.assertNotIn('X-Page-Cache', response)
+            with mock.patch('writers_app.middleware.get_cached_page') as lookup:
+                self.client.get(reverse('about'), HTTP_HOST='attacker.example')
+            lookup.assert_not_called()
+
+
+class ServiceDetailETagTests(TestCase):
+    """The service page's ETag changes when the featured testimonials it shows change"""
+
+    def setUp(self):
+        self.service = Service.objects.create(
+            name='Resume Writing', description='-', short_description='-', icon='fa-file-alt'
+        )
+        user = User.objects.create_user('client', 'client@example.com')
+        self.testimonials = [
+            Testimonial.objects.create(user=user, content=f'Review {number}', is_approved=True, is_featured=True)
+            for number in range(4)
+        ]
+
+    def etag(self):
+        request = RequestFactory().get(reverse('service_detail', args=[self.service.slug]))
+        request.user = AnonymousUser()
+        view = ServiceDetailView(request=request, kwargs={'slug': self.service.slug})
+        return view._conditional_etag(request)
+
+    def test_unfeaturing_a_shown_testimonial_changes_the_etag(self):
+        before = self.etag()
+        # Not the most recently updated, and a bulk update leaves updated_at alone
+        Testimonial.objects.filter(pk=self.testimonials[1].pk).update(is_featured=False)
+        self.assertNotEqual(self.etag(), before)
+
+    def test_unchanged_testimonials_keep_the_etag(self):
+        self.assertEqual(self.etag(), self.etag())
+
+
+class NewsletterCsrfTests(TestCase):
+    """Subscribing needs a CSRF token, which static pages fetch from /api/csrf/"""
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+
+    def subscribe(self, **data):
+        return self.client.post(reverse('subscribe_newsletter'), dict(email='reader@example.com', **data))
+
+    def test_post_without_a_token_is_refused(self):
+        self.assertEqual(self.subscribe().status_code, 403)
+        self.assertFalse(NewsletterSubscriber.objects.exists())
+
+    def test_fetched_token_is_accepted(self):
+        token = self.client.get(reverse('get_csrf_token')).json()['csrf_token']
+        self.assertEqual(self.subscribe(csrfmiddlewaretoken=token).status_code, 302)
+        self.assertTrue(NewsletterSubscriber.objects.filter(email='reader@example.com').exists())
+
+
+class DashboardSummaryTests(TestCase):
+    """Archiving orders doesn't change the client's lifetime totals"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('client', 'client@example.com', password='secret')
+        for number, (status, payment_status, amount) in enumerate([
+            ('completed', 'paid', 100), ('cancelled', 'pending', 50), ('in_progress', 'paid', 200),
+        ]):
+            order = create_order(
+                self.user, f'T{number:08d}', amount=amount, status=status, payment_status=payment_status,
+            )
+            # Old enough to archive
+            Order.objects.filter(pk=order.pk).update(updated_at=timezone.now() - timedelta(days=400))
+        self.client.force_login(self.user)
+
+    def summary(self):
+        return self.client.get(reverse('dashboard')).context['order_summary']
+
+    def test_totals_survive_archiving(self):
+        before = self.summary()
+        self.assertEqual(archive_orders(months=1), 2)
+        after = self.summary()
+        for field in ('total', 'completed', 'paid', 'total_spent'):
+            self.assertEqual(after[field], before[field], field)
+        self.assertEqual(after['total'], 3)
+        self.assertEqual(after['total_spent'], 300)
+
+
+@override_settings(CHAT_FLUSH_INTERVAL=0.01, CHAT_FLUSH_MAX_ATTEMPTS=3)
+class ChatMessageBufferTests(TransactionTestCase):
+    """Buffered chat messages are saved in order, past bad rows, with bounded retries"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('client', 'client@example.com')
+        self.order = create_order(self.user)
+        self.buffer = ChatMessageBuffer()
+        patcher = mock.patch('writers_app.chat_buffer.get_channel_layer')
+        self.channel_layer = patcher.start().return_value
+        self.channel_layer.group_send = mock.AsyncMock()
+        self.addCleanup(patcher.stop)
+
+    def message(self, text, key):
+        message = ChatMessage(order=self.order, user=self.user, message=text)
+        message.chat_key = key
+        return message
+
+    def add_and_flush(self, *messages):
+        async def run():
+            for message in messages:
+                self.buffer.add(message)
+            return await self.buffer.flush()
+        return asyncio.run(run())
+
+    def saved_texts(self):
+        return list(ChatMessage.objects.order_by('id').values_list('message', flat=True))
+
+    def test_one_bad_row_does_not_block_the_rest(self):
+        with self.assertLogs('writers_app.chat_buffer') as logs:
+            saved = self.add_and_flush(
+                self.message('first', 'a'), self.message(None, 'bad'), self.message('second', 'b'),
+            )
+        self.assertEqual(saved, 2)
+        self.assertIn('Dropping chat message', logs.output[-1])
+        self.assertEqual(self.saved_texts(), ['first', 'second'])
+        self.assertEqual(self.buffer.pending_count(), 0)
+
+    def test_saved_ids_are_announced_to_the_room(self):
+        with self.assertLogs('writers_app.chat_buffer'):
+            self.add_and_flush(self.message('first', 'a'), self.message(None, 'bad'), self.message('second', 'b'))
+        ids = dict(ChatMessage.objects.values_list('message', 'id'))
+        self.channel_layer.group_send.assert_awaited_once_with(
+            chat_group_name(self.order.pk),
+            {'type': 'chat_saved', 'ids': {'a': ids['first'], 'b': ids['second']}},
+        )
+
+    def test_failing_database_retries_up_to_the_cap(self):
+        self.buffer._pending = [self.message('first', 'a'), self.message('second', 'b')]
+        failing = mock.patch.object(ChatMessage.objects, 'bulk_create', side_effect=OperationalError('database is locked'))
+        with failing, self.assertLogs('writers_app.chat_buffer') as logs:
+            for attempt in range(1, 3):
+                self.assertEqual(self.buffer.flush_sync(), 0)
+                # Requeued in send order
+                self.assertEqual([m.message for m in self.buffer._pending], ['first', 'second'])
+                self.assertEqual([m.flush_attempts for m in self.buffer._pending], [attempt, attempt])
+            self.assertEqual(self.buffer.flush_sync(), 0)
+        self.assertIn('after 3 failed flushes', logs.output[-1])
+        self.assertEqual(self.buffer.pending_count(), 0)
+        self.assertEqual(self.saved_texts(), [])
+
+    def test_requeued_rows_are_saved_once_the_database_recovers(self):
+        self.buffer._pending = [self.message('first', 'a')]
+        failing = mock.patch.object(ChatMessage.objects, 'bulk_create', side_effect=OperationalError('database is locked'))
+        with failing, self.assertLogs('writers_app.chat_buffer'):
+            self.buffer.flush_sync()
+        self.assertEqual(self.add_and_flush(self.message('second', 'b')), 2)
+        self.assertEqual(self.saved_texts(), ['first', 'second'])
+
+    def test_timer_from_a_stopped_loop_is_replaced(self):
+        # A worker whose previous loop stopped with the flush timer still pending
+        old_loop = asyncio.new_event_loop()
+        self.addCleanup(old_loop.close)
+
+        async def add_first():
+            self.buffer.add(self.message('first', 'a'))
+        old_loop.run_until_complete(add_first())
+        stale_timer = self.buffer._timer
+        self.addCleanup(old_loop.run_until_complete, asyncio.gather(stale_timer, return_exceptions=True))
+        self.addCleanup(stale_timer.cancel)
+
+        async def add_second():
+            self.buffer.add(self.message('second', 'b'))
+            await asyncio.sleep(0.2)
+        asyncio.run(add_second())
+        self.assertEqual(self.saved_texts(), ['first', 'second'])
+
+
+class ChatSocket(ApplicationCommunicator):
+    """Drives ChatConsumer over ASGI as a signed-in user's browser would"""
+
+    def __init__(self, order_id, user):
+        application = URLRouter(websocket_urlpatterns)
+        super().__init__(application, {
+            'type': 'websocket', 'path': f'/ws/chat/{order_id}/', 'headers': [], 'subprotocols': [], 'user': user,
+        })
+
+    async def connect(self):
+        await self.send_input({'type': 'websocket.connect'})
+        return (await self.receive_output(1))['type'] == 'websocket.accept'
+
+    async def send_json(self, data):
+        await self.send_input({'type': 'websocket.receive', 'text': json.dumps(data)})
+
+    async def receive_json(self):
+        return json.loads((await self.receive_output(1))['text'])
+
+    async def receive_until(self, frame_type):
+        """The next frame of frame_type, plus the frames that arrived before it"""
+        skipped = []
+        while True:
+            frame = await self.receive_json()
+            if frame['type'] == frame_type:
+                return frame, skipped
+            skipped.append(frame)
+
+    async def disconnect(self):
+        await self.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await self.wait(1)
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class ChatSyncTests(TransactionTestCase):
+    """A reconnecting client is sent exactly the messages after the last id it showed"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user('client', 'client@example.com')
+        self.support = User.objects.create_user('support', 'support@example.com', is_staff=True)
+        self.order = create_order(self.owner)
+        self.ids = [
+            ChatMessage.objects.create(order=self.order, user=self.owner, message=f'message {number}').pk
+            for number in range(3)
+        ]
+
+    def run_sockets(self, scenario):
+        async def run():
+            sockets = [ChatSocket(self.order.pk, self.owner), ChatSocket(self.order.pk, self.support)]
+            for socket in sockets:
+                self.assertTrue(await socket.connect())
+            try:
+                return await scenario(*sockets)
+            finally:
+                for socket in sockets:
+                    await socket.disconnect()
+        return asyncio.run(run())
+
+    def test_sync_sends_only_newer_messages(self):
+        async def scenario(owner, support):
+            await owner.send_json({'type': 'sync', 'last_id': self.ids[0]})
+            return await owner.receive_json()
+        history = self.run_sockets(scenario)
+        self.assertEqual([message['id'] for message in history['messages']], self.ids[1:])
+        self.assertFalse(history['has_more'])
+
+    @override_settings(CHAT_MESSAGES_PAGE_SIZE=2)
+    def test_sync_pages_through_a_long_history(self):
+        async def scenario(owner, support):
+            await owner.send_json({'type': 'sync', 'last_id': 0})
+            return [await owner.receive_json(), await owner.receive_json()]
+        first, second = self.run_sockets(scenario)
+        self.assertEqual([message['id'] for message in first['messages']], self.ids[:2])
+        self.assertTrue(first['has_more'])
+        self.assertEqual([message['id'] for message in second['messages']], self.ids[2:])
+        self.assertFalse(second['has_more'])
+
+    def test_buffered_message_is_not_skipped(self):
+        # Support sends a message the owner never showed (say, while reconnecting);
+        # it is still buffered when the owner syncs from the last id it has
+        async def scenario(owner, support):
+            await support.send_json({'type': 'message', 'message': 'still buffered'})
+            live, _ = await support.receive_until('message')
+            await owner.send_json({'type': 'sync', 'last_id': self.ids[-1]})
+            history, _ = await owner.receive_until('history')
+            saved, _ = await support.receive_until('saved')
+            return live, history, saved
+        live, history, saved = self.run_sockets(scenario)
+        self.assertEqual([message['message'] for message in history['messages']], ['still buffered'])
+        self.assertEqual(saved['ids'], {live['key']: history['messages'][0]['id']})
+
+    def test_invalid_last_id_is_an_error(self):
+        async def scenario(owner, support):
+            await owner.send_json({'type': 'sync', 'last_id': 'latest'})
+            return await owner.receive_json()
+        self.assertEqual(self.run_sockets(scenario)['type'], 'error')
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Public reads use the replica unless the visitor just wrote; cached blocks are built on the primary"""
+
+    # The replica is a test mirror of the primary (see settings)
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        author = User.objects.create_user('author', 'author@example.com')
+        BlogPost.objects.create(title='Resume tips', slug='resume-tips', content='-', author=author, is_published=True)
+
+    def get_blog(self, client):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = client.get(reverse('blog'))
+        self.assertEqual(response.status_code, 200)
+        return response, self.reads(primary), self.reads(replica)
+
+    def reads(self, queries):
+        """Which of the blog page's reads ran on a connection"""
+        reads = set()
+        for query in queries:
+            if 'writers_app_blogpost' in query['sql']:
+                # The post count is a cached block; the page of posts is not
+                reads.add('post count' if 'COUNT(' in query['sql'] else 'posts')
+            elif 'writers_app_service' in query['sql']:
+                reads.add('services menu')
+        return reads
+
+    def test_unpinned_reads_use_the_replica(self):
+        response, primary, replica = self.get_blog(Client())
+        self.assertIn('posts', replica)
+        self.assertNotIn('posts', primary)
+        self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_pinned_reads_use_the_primary(self):
+        client = Client()
+        client.cookies[ReplicaPinningMiddleware.cookie_name] = '1'
+        response, primary, replica = self.get_blog(client)
+        self.assertIn('posts', primary)
+        self.assertEqual(replica, set())
+        # Only a write renews the pin
+        self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_cached_blocks_are_built_on_the_primary(self):
+        response, primary, replica = self.get_blog(Client())
+        # Cached longer than the replica lags, so never built from it
+        self.assertEqual(primary & {'post count', 'services menu'}, {'post count', 'services menu'})
+        self.assertEqual(replica & {'post count', 'services menu'}, set())
+
+    def test_write_sets_the_pin(self):
+        response = Client().post(reverse('subscribe_newsletter'), {'email': 'reader@example.com'})
+        self.assertEqual(response.cookies[ReplicaPinningMiddleware.cookie_name]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+
+class AdminStatRollupTests(TestCase):
+    """The signal-maintained rollup always equals a fresh aggregate of the orders"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('client', 'client@example.com')
+        self.paid = create_order(self.user, 'T00000001', amount=100, payment_status='paid', status='confirmed')
+        self.unpaid = create_order(self.user, 'T00000002', amount=50)
+
+    def assert_rollup_is_fresh(self):
+        rollup = {
+            (stat.name, stat.key): (stat.count, stat.amount)
+            for stat in AdminStat.objects.all() if stat.count or stat.amount
+        }
+        fresh = {row: totals for row, totals in compute_admin_stats().items() if any(totals)}
+        self.assertEqual(rollup, fresh)
+
+    def test_new_orders(self):
+        self.assert_rollup_is_fresh()
+        self.assertEqual(get_admin_stats()['total_revenue'], 100)
+
+    def test_status_change(self):
+        self.paid.status = 'completed'
+        self.paid.save()
+        self.assert_rollup_is_fresh()
+
+    def test_amount_change(self):
+        self.paid.amount = 120
+        self.paid.save()
+        self.unpaid.amount = 80
+        self.unpaid.payment_status = 'paid'
+        self.unpaid.save()
+        self.assert_rollup_is_fresh()
+        self.assertEqual(get_admin_stats()['total_revenue'], 200)
+
+    def test_delete(self):
+        self.paid.delete()
+        self.assert_rollup_is_fresh()
+        self.assertEqual(get_admin_stats()['total_orders'], 1)
+
+    def test_archived_orders_still_count(self):
+        self.paid.status = 'completed'
+        self.paid.save()
+        Order.objects.filter(pk=self.paid.pk).update(updated_at=timezone.now() - timedelta(days=400))
+        self.assertEqual(archive_orders(months=1), 1)
+        self.assert_rollup_is_fresh()
+        self.assertEqual(get_admin_stats()['total_orders'], 2)
+
+    def test_recompute_corrects_drift(self):
+        # e.g. a queryset.update() that bypassed the signals
+        Order.objects.filter(pk=self.unpaid.pk).update(payment_status='paid')
+        AdminStat.objects.filter(name=AdminStat.USERS).update(count=99)
+        self.assertEqual(recompute_admin_stats(), len(compute_admin_stats()))
+        self.assert_rollup_is_fresh()
+        self.assertEqual(get_admin_stats()['total_revenue'], 150)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages cover every row once, even when the sort key ties"""
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        self.category = SampleCategory.objects.create(name='Resumes', slug='resumes')
+        for number in range(7):
+            ResumeSample.objects.create(
+                title=f'Sample {number}', category=self.category, image='samples/x.png', is_featured=number % 3 == 0,
+            )
+        # Every sample shares one created_at, so only id breaks the ties
+        ResumeSample.objects.update(created_at=timezone.now())
+        self.samples = ResumeSample.objects.all()
+        self.expected = list(self.samples.order_by(*SAMPLE_ORDERING).values_list('id', flat=True))
+
+    def walk(self, limit):
+        ids, cursor, pages = [], None, 0
+        while True:
+            page, cursor = keyset_page(self.samples, SAMPLE_ORDERING, cursor, limit)
+            ids.extend(sample.id for sample in page)
+            pages += 1
+            if cursor is None:
+                return ids, pages
+
+    def test_pages_cover_every_row_once_despite_ties(self):
+        for limit in (1, 2, 3, 7, 10):
+            self.assertEqual(self.walk(limit), (self.expected, -(-7 // limit)), limit)
+
+    def test_full_last_page_has_no_next_cursor(self):
+        page, cursor = keyset_page(self.samples, SAMPLE_ORDERING, None, 7)
+        self.assertEqual(len(page), 7)
+        self.assertIsNone(cursor)
+
+    def test_tampered_cursors_are_rejected(self):
+        page, cursor = keyset_page(self.samples, SAMPLE_ORDERING, None, 3)
+        wrong_length = base64.urlsafe_b64encode(b'[true,"2026-01-01T00:00:00"]').decode()
+        wrong_type = base64.urlsafe_b64encode(b'["maybe","2026-01-01T00:00:00",1]').decode()
+        for tampered in ('not a cursor!', cursor[:-2], wrong_length, wrong_type):
+            with self.assertRaises(InvalidCursor, msg=tampered):
+                decode_cursor(tampered, ResumeSample, SAMPLE_ORDERING)
+
+    def test_invalid_cursor_is_a_404_on_list_pages(self):
+        response = self.client.get(reverse('blog'), {'cursor': 'not a cursor!'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_cursor_is_a_400_from_the_api(self):
+        response = self.client.get(reverse('samples_page', args=['resumes']), {'cursor': 'not a cursor!'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_api_pages_end_without_a_cursor(self):
+        response = self.client.get(reverse('samples_page', args=['resumes']), {'limit': 7})
+        self.assertEqual([sample['id'] for sample in response.json()['samples']], self.expected)
+        self.assertIsNone(response.json()['next_cursor'])
+
+    def test_parse_limit_bounds(self):
+        for value, expected in ((None, 12), ('many', 12), ('0', 1), ('-5', 1), ('7', 7), ('48', 48), ('1000', 48)):
+            self.assertEqual(parse_limit(value, 12, 48), expected, value)
+
+
+class ViewCounterTests(TestCase):
+    """Views are buffered and applied in one F() update per row"""
+
+    def setUp(self):
+        self.store = MemoryCounterStore()
+        for patcher in (
+            mock.patch.object(counters, '_store', self.store),
+            # The background flusher would race the test's own flushes
+            mock.patch.object(counters, '_ensure_flusher'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        category = SampleCategory.objects.create(name='Resumes', slug='resumes')
+        self.popular, self.other = [
+            ResumeSample.objects.create(title=title, category=category, image='samples/x.png')
+            for title in ('Popular', 'Other')
+        ]
+
+    def test_flush_applies_summed_views_in_one_update_per_row(self):
+        for _ in range(3):
+            record_view(self.popular)
+        record_view(self.other)
+        updated_at = ResumeSample.objects.get(pk=self.popular.pk).updated_at
+
+        with CaptureQueriesContext(connections['default']) as queries:
+            self.assertEqual(flush_view_counts(), 2)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        # Relative to the stored value, so concurrent flushes from other workers add up
+        self.assertTrue(all('."view_count" + ' in sql for sql in updates))
+
+        self.popular.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.popular.view_count, self.other.view_count), (3, 1))
+        # No save(), so updated_at and conditional GET validators don't move
+        self.assertEqual(self.popular.updated_at, updated_at)
+        self.assertEqual(flush_view_counts(), 0)
+
+    def test_failed_flush_puts_the_views_back(self):
+        record_view(self.popular)
+        record_view(self.popular)
+        with mock.patch.object(QuerySet, 'update', side_effect=OperationalError('database is locked')):
+            with self.assertRaises(OperationalError):
+                flush_view_counts()
+        self.popular.refresh_from_db()
+        self.assertEqual(self.popular.view_count, 0)
+
+        self.assertEqual(flush_view_counts(), 1)
+        self.popular.refresh_from_db()
+        self.assertEqual(self.popular.view_count, 2)
+
+
+class LargeTableAdminTests(TestCase):
+    """Changelists of unbounded tables skip the exact COUNT(*)"""
+
+    def test_user_changelist_uses_the_estimated_count(self):
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:writers_app_user_changelist'))
+        self.assertEqual(response.status_code, 200)
+        changelist = response.context['cl']
+        self.assertIsInstance(changelist.paginator, EstimatedCountPaginator)
+        self.assertFalse(changelist.model_admin.show_full_result_count)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite transaction mode')
+class SqliteTransactionTests(TransactionTestCase):
+    """atomic() takes SQLite's write lock up front, so read-then-write blocks wait instead of failing"""
+
+    def test_atomic_begins_immediate(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                NewsletterSubscriber.objects.create(email='reader@example.com')
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
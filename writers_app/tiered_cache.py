@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+
+
+class LocalLRU:
+    """Small thread-safe LRU with per-entry expiry, private to one worker process"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (found, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoTierCache:
+    """
+    Per-worker LRU in front of the shared cache (Redis in production).
+
+    The local tier only lives for a few seconds, which bounds how stale a
+    worker can be after another worker invalidates a key. get_or_set()
+    coalesces rebuilds: threads in a worker queue on a per-key lock, and
+    workers race for a lock key in the shared cache, so only one of them
+    runs the builder while the rest wait for its result.
+    """
+
+    LOCK_PREFIX = 'writers_app:lock'
+
+    def __init__(self, shared=shared_cache, max_entries=None, local_timeout=None,
+                 lock_timeout=None, wait_timeout=None, poll_interval=0.05):
+        self.shared = shared
+        self.local = LocalLRU(max_entries or getattr(settings, 'LOCAL_CACHE_MAX_ENTRIES', 256))
+        self.local_timeout = local_timeout or getattr(settings, 'LOCAL_CACHE_TIMEOUT', 5)
+        self.lock_timeout = lock_timeout or getattr(settings, 'CACHE_LOCK_TIMEOUT', 30)
+        self.wait_timeout = wait_timeout or getattr(settings, 'CACHE_WAIT_TIMEOUT', 5)
+        self.poll_interval = poll_interval
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+
+    def get(self, key):
+        """Return the value from the nearest tier, or None"""
+        found, value = self.local.get(key)
+        if found:
+            return value
+        value = self.shared.get(key)
+        if value is not None:
+            self.local.set(key, value, self.local_timeout)
+        return value
+
+    def set(self, key, value, timeout):
+        self.shared.set(key, value, timeout)
+        self.local.set(key, value, min(self.local_timeout, timeout or self.local_timeout))
+
+    def delete_many(self, keys):
+        self.shared.delete_many(keys)
+        for key in keys:
+            self.local.delete(key)
+
+    def get_or_set(self, key, builder, timeout):
+        """Return (value, hit), running builder at most once across workers on a miss"""
+        value = self.get(key)
+        if value is not None:
+            return value, True
+
+        with self._key_lock(key):
+            # Another thread in this worker may have rebuilt it while we waited
+            value = self.get(key)
+            if value is not None:
+                return value, True
+
+            lock_key = f'{self.LOCK_PREFIX}:{key}'
+            acquired = self.shared.add(lock_key, 1, self.lock_timeout)
+            if not acquired:
+                value = self._wait_for(key)
+                if value is not None:
+                    return value, True
+                # The lock holder is slow or died; build it ourselves
+
+            try:
+                value = builder()
+                self.set(key, value, timeout)
+            finally:
+                if acquired:
+                    self.shared.delete(lock_key)
+            return value, False
+
+    def _wait_for(self, key):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, self.local_timeout)
+                return value
+        return None
+
+    def _key_lock(self, key):
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+
+tiered_cache = TwoTierCache()
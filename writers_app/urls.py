@@ -54,11 +54,17 @@ urlpatterns = [
     path('order/<int:order_id>/payment/', views.PaymentView.as_view(), name='payment'),
     path('order/<int:order_id>/success/', views.PaymentSuccessView.as_view(), name='payment_success'),
     path('order/<int:order_id>/chat/', views.ChatView.as_view(), name='chat'),
+    path('orders/archive/', views.ArchivedOrderListView.as_view(), name='archived_orders'),
+    path('orders/archive/<str:order_number>/', views.ArchivedOrderDetailView.as_view(), name='archived_order'),
 
     # API endpoints
+    path('api/csrf/', views.get_csrf_token, name='get_csrf_token'),
     path('api/newsletter/subscribe/', views.subscribe_newsletter, name='subscribe_newsletter'),
     path('api/payment/razorpay/verify/', views.verify_razorpay_payment, name='verify_razorpay_payment'),
     path('api/chat/<int:order_id>/messages/', views.get_chat_messages, name='get_chat_messages'),
+    path('api/samples/<slug:slug>/', views.samples_page, name='samples_page'),
+    path('api/samples/<int:sample_id>/view/', views.record_sample_view, name='record_sample_view'),
+    path('api/pricing/', views.pricing_matrix, name='pricing_matrix'),
     
     # Admin dashboard (for staff users)
     path('admin-dashboard/', views.AdminDashboardView.as_view(), name='admin_dashboard'),
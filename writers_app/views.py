@@ -8,36 +8,236 @@ from django.views.generic import (
     TemplateView, ListView, DetailView, CreateView, UpdateView
 )
 from django.contrib import messages
-from django.http import JsonResponse
+from django.middleware.csrf import get_token
+from django.http import Http404, HttpResponse, JsonResponse
 from django.conf import settings
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import Q, Max, Count, Sum, Prefetch
+from django.utils.cache import quote_etag
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
+from django.views.decorators.http import condition, require_POST
+import hashlib
 import json
 import razorpay
 
 from .models import *
 from .forms import *
 from .utils import send_email, create_razorpay_order, verify_payment_signature
+from .cache import (
+    HOMEPAGE_CONTEXT_KEY, SAMPLES_CONTEXT_KEY, TESTIMONIAL_COUNT_KEY, BLOG_POST_COUNT_KEY,
+    CSRF_TOKEN_PLACEHOLDER, get_or_build,
+    get_cached_page, build_page_response, page_cacheable_host, page_generation,
+)
+from .pricing import get_pricing_matrix
+from .counters import record_view
+from .stats import get_admin_stats
+from .routers import read_from_replica
+from .archive import unpack_order
+from .pagination import InvalidCursor, keyset_page, split_page, parse_limit
+
+# Keyset ordering for the samples gallery; id makes it a total order
+SAMPLE_ORDERING = ['-is_featured', '-created_at', '-id']
+
+
+def build_homepage_context():
+    """Evaluate the homepage content blocks into plain lists for caching"""
+    return {
+        'testimonials': list(Testimonial.objects.filter(is_featured=True, is_approved=True)[:6]),
+        'blog_posts': list(BlogPost.objects.filter(is_published=True)[:3]),
+        'services': list(Service.objects.filter(is_active=True)[:6]),
+        'featured_samples': list(
+            ResumeSample.objects.filter(is_featured=True, is_active=True).select_related('category')[:6]
+        ),
+    }
+
+
+class PageCacheMixin:
+    """
+    Serve and store the rendered page for anonymous visitors.
+
+    Pages are rendered with a CSRF placeholder, which is swapped for the
+    visitor's own token on the way out. PageCacheMiddleware stores the
+    placeholder copy and answers cookie-less visitors before the view runs.
+    """
+
+    # Tells PageCacheMiddleware this view's path may have a cached page
+    page_cache = True
+
+    def get(self, request, *args, **kwargs):
+        self.page_cacheable = self.is_page_cacheable()
+        if self.page_cacheable:
+            page = get_cached_page(request)
+            if page is not None:
+                return build_page_response(request, page)
+        return super().get(request, *args, **kwargs)
+
+    def is_page_cacheable(self):
+        return (
+            settings.PAGE_CACHE_ENABLED
+            and page_cacheable_host(self.request)
+            and not self.request.user.is_authenticated
+            and not len(messages.get_messages(self.request))
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.page_cacheable:
+            context['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        if self.page_cacheable:
+            response.add_post_render_callback(self._fill_csrf_token)
+        return response
+
+    def _fill_csrf_token(self, response):
+        # Tracking parameters (utm_*, gclid) reuse the page but never seed it
+        if not self.request.GET:
+            response.page_cache_content = response.content
+        response.content = response.content.replace(
+            CSRF_TOKEN_PLACEHOLDER.encode(), get_token(self.request).encode()
+        )
+
+
+class ReplicaReadMixin:
+    """
+    Serve this read-only view's queries from the read replica when one is configured.
+
+    Values built for the shared cache via get_or_build still read from the
+    primary, since they are cached longer than the replica lags.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            # Render here so template-time queries (context processors) use the replica too
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
 
 
-class IndexView(TemplateView):
+class KeysetPaginationMixin:
+    """
+    Page a ListView by ?cursor= instead of ?page=.
+
+    Each page seeks past the last row of the previous one using
+    keyset_ordering (ending in a unique field), so deep pages cost the same
+    as the first. The total is counted once and cached under
+    count_cache_key until the signal handlers invalidate it.
+    """
+    keyset_ordering = None
+    count_cache_key = None
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get('cursor')
+        try:
+            objects, self.next_cursor = keyset_page(queryset, self.keyset_ordering, cursor, page_size)
+        except InvalidCursor:
+            raise Http404('Invalid page cursor')
+        return None, None, objects, bool(cursor or self.next_cursor)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        context['is_first_page'] = not self.request.GET.get('cursor')
+        context['total_count'] = get_or_build(self.count_cache_key, lambda: self.get_queryset().count())
+        return context
+
+
+class ConditionalGetMixin:
+    """
+    Answer revalidation requests with 304 before the template is rendered.
+
+    Subclasses implement get_last_modified() with a cheap updated_at lookup.
+    The ETag also covers the deploy version, the page generation (bumped when
+    the shared service menu changes) and the visitor, since base.html
+    renders per-user navigation. No Last-Modified is sent: a row timestamp
+    alone can't see a deploy or a menu change, and a client revalidating
+    with If-Modified-Since only would be told a stale page is current.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(etag_func=self._conditional_etag)(super().dispatch)
+        return view(request, *args, **kwargs)
+
+    def get_last_modified(self):
+        raise NotImplementedError
+
+    def get_etag_parts(self):
+        return ()
+
+    def _freshness(self):
+        if not hasattr(self, '_last_modified'):
+            self._last_modified = self.get_last_modified()
+        return self._last_modified
+
+    def _conditional_etag(self, request, *args, **kwargs):
+        last_modified = self._freshness()
+        if last_modified is None or len(messages.get_messages(request)):
+            return None
+        parts = [
+            settings.DEPLOY_VERSION, page_generation(), last_modified.isoformat(), request.user.pk or 'anon'
+        ]
+        parts.extend(self.get_etag_parts())
+        digest = hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+        return quote_etag(digest)
+
+
+def build_samples_context():
+    """Load active categories with the first page of their samples in a fixed number of queries"""
+    page_size = settings.SAMPLES_PAGE_SIZE
+    # Over-fetch one row per category to know whether a next page exists
+    first_pages = ResumeSample.objects.filter(is_active=True).order_by(*SAMPLE_ORDERING)[:page_size + 1]
+    categories = list(
+        SampleCategory.objects.filter(is_active=True).order_by('order').prefetch_related(
+            Prefetch('samples', queryset=first_pages, to_attr='first_page')
+        )
+    )
+    samples_by_category = {}
+    for category in categories:
+        samples, category.next_cursor = split_page(category.first_page, SAMPLE_ORDERING, page_size)
+        samples_by_category[category] = samples
+    return {
+        'categories': categories,
+        'samples_by_category': samples_by_category,
+    }
+
+
+def serialize_sample(sample):
+    return {
+        'id': sample.id,
+        'title': sample.title,
+        'sample_type': sample.sample_type,
+        'sample_type_display': sample.get_sample_type_display(),
+        'image_url': sample.image.url,
+        'view_count': sample.view_count,
+        'created_at': sample.created_at.date().isoformat(),
+    }
+
+
+class IndexView(ReplicaReadMixin, TemplateView):
     template_name = 'index.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['testimonials'] = Testimonial.objects.filter(is_featured=True, is_approved=True)[:6]
-        context['blog_posts'] = BlogPost.objects.filter(is_published=True)[:3]
-        context['services'] = Service.objects.filter(is_active=True)[:6]
-        context['featured_samples'] = ResumeSample.objects.filter(is_featured=True, is_active=True)[:6]
+        # Invalidated by the signal handlers in writers_app.signals
+        context.update(get_or_build(
+            HOMEPAGE_CONTEXT_KEY,
+            build_homepage_context,
+            timeout=settings.HOMEPAGE_CACHE_TIMEOUT,
+            stats_name='homepage',
+        ))
         return context
 
 
-class AboutView(TemplateView):
+class AboutView(PageCacheMixin, TemplateView):
     template_name = 'about.html'
 
 
-class ServicesView(ListView):
+class ServicesView(ReplicaReadMixin, ListView):
     model = Service
     template_name = 'services.html'
     context_object_name = 'services'
@@ -46,7 +246,7 @@ class ServicesView(ListView):
         return Service.objects.filter(is_active=True)
 
 
-class ServiceDetailView(DetailView):
+class ServiceDetailView(ConditionalGetMixin, DetailView):
     model = Service
     template_name = 'service_detail.html'
     context_object_name = 'service'
@@ -54,56 +254,97 @@ class ServiceDetailView(DetailView):
     def get_queryset(self):
         return Service.objects.filter(is_active=True)
     
+    def get_last_modified(self):
+        service = self.get_queryset().filter(slug=self.kwargs['slug']).annotate(
+            packages_updated_at=Max('packages__updated_at'),
+            package_count=Count('packages'),
+        ).values('updated_at', 'packages_updated_at', 'package_count').first()
+        if service is None:
+            return None
+        self.package_count = service['package_count']
+        # The testimonials actually shown, so one joining or leaving the top three changes the ETag
+        testimonials = list(self.featured_testimonials().values_list('id', 'updated_at'))
+        self.testimonial_ids = tuple(pk for pk, updated_at in testimonials)
+        return max(filter(None, [
+            service['updated_at'], service['packages_updated_at'],
+            *(updated_at for pk, updated_at in testimonials),
+        ]))
+    
+    def get_etag_parts(self):
+        return (self.package_count, self.testimonial_ids)
+    
+    def featured_testimonials(self):
+        return Testimonial.objects.filter(is_approved=True, is_featured=True)[:3]
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['packages'] = self.object.packages.filter(is_active=True).order_by('display_order')
-        context['testimonials'] = Testimonial.objects.filter(is_approved=True, is_featured=True)[:3]
+        context['testimonials'] = self.featured_testimonials()
         return context
 
 
-class PricingView(TemplateView):
+class PricingView(ConditionalGetMixin, TemplateView):
     template_name = 'pricing.html'
     
+    def get_last_modified(self):
+        self.matrix = get_pricing_matrix()
+        return self.matrix['last_modified']
+    
+    def get_etag_parts(self):
+        return (self.matrix['digest'],)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['services'] = Service.objects.filter(is_active=True).prefetch_related('packages')
+        context['services'] = self.matrix['services']
         return context
 
 
-class TestimonialsView(ListView):
+class TestimonialsView(KeysetPaginationMixin, ListView):
     model = Testimonial
     template_name = 'testimonials.html'
     context_object_name = 'testimonials'
     paginate_by = 12
+    keyset_ordering = ['-created_at', '-id']
+    count_cache_key = TESTIMONIAL_COUNT_KEY
     
     def get_queryset(self):
-        return Testimonial.objects.filter(is_approved=True).order_by('-created_at')
+        return Testimonial.objects.filter(is_approved=True).select_related('user')
 
 
-class BlogListView(ListView):
+class BlogListView(ReplicaReadMixin, KeysetPaginationMixin, ListView):
     model = BlogPost
     template_name = 'blog.html'
     context_object_name = 'posts'
     paginate_by = 9
+    keyset_ordering = ['-published_at', '-id']
+    count_cache_key = BLOG_POST_COUNT_KEY
     
     def get_queryset(self):
-        return BlogPost.objects.filter(is_published=True).order_by('-published_at')
+        return BlogPost.objects.filter(
+            is_published=True, published_at__isnull=False
+        ).select_related('author')
 
 
-class BlogDetailView(DetailView):
+class BlogDetailView(ConditionalGetMixin, DetailView):
     model = BlogPost
     template_name = 'blog_post.html'
     context_object_name = 'post'
     slug_field = 'slug'
     
+    def get_last_modified(self):
+        return self.get_queryset().filter(slug=self.kwargs['slug']).values_list(
+            'updated_at', flat=True
+        ).first()
+    
     def get_object(self):
         obj = super().get_object()
+        # Buffered and flushed in the background by writers_app.counters
+        record_view(obj)
         obj.view_count += 1
-        obj.save()
         return obj
 
 
-class FAQView(ListView):
+class FAQView(ReplicaReadMixin, ListView):
     model = FAQ
     template_name = 'faq.html'
     context_object_name = 'faqs'
@@ -140,57 +381,53 @@ class ContactView(CreateView):
         return response
 
 
-class SamplesView(TemplateView):
+class SamplesView(ReplicaReadMixin, TemplateView):
     template_name = 'samples.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        categories = SampleCategory.objects.filter(is_active=True).order_by('order')
-        samples_by_category = {}
-        
-        for category in categories:
-            samples_by_category[category] = ResumeSample.objects.filter(
-                category=category, is_active=True
-            ).order_by('-is_featured', '-created_at')
-        
-        context['samples_by_category'] = samples_by_category
-        context['categories'] = categories
+        # Invalidated by the signal handlers in writers_app.signals
+        context.update(get_or_build(
+            SAMPLES_CONTEXT_KEY,
+            build_samples_context,
+            stats_name='samples',
+        ))
         return context
 
 
-class PrivacyView(TemplateView):
+class PrivacyView(PageCacheMixin, TemplateView):
     template_name = 'privacy.html'
 
 
-class TermsView(TemplateView):
+class TermsView(PageCacheMixin, TemplateView):
     template_name = 'terms.html'
 
 
-class RefundView(TemplateView):
+class RefundView(PageCacheMixin, TemplateView):
     template_name = 'refund.html'
 
 
-class LinkedInView(TemplateView):
+class LinkedInView(PageCacheMixin, TemplateView):
     template_name = 'linkedin_service.html'
 
 
-class VisualCVView(TemplateView):
+class VisualCVView(PageCacheMixin, TemplateView):
     template_name = 'visual_cv_service.html'
 
 
-class InfographicCVView(TemplateView):
+class InfographicCVView(PageCacheMixin, TemplateView):
     template_name = 'infographic_cv_service.html'
 
 
-class JobHuntView(TemplateView):
+class JobHuntView(PageCacheMixin, TemplateView):
     template_name = 'job_hunt_service.html'
 
 
-class SOPView(TemplateView):
+class SOPView(PageCacheMixin, TemplateView):
     template_name = 'sop_service.html'
 
 
-class LORView(TemplateView):
+class LORView(PageCacheMixin, TemplateView):
     template_name = 'lor_service.html'
 
 
@@ -226,8 +463,42 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['orders'] = Order.objects.filter(user=self.request.user).order_by('-created_at')
-        context['recent_orders'] = context['orders'][:5]
+        user_orders = Order.objects.filter(user=self.request.user)
+        
+        # Every per-status figure on the page in a single aggregate query
+        summary = user_orders.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='pending')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            completed=Count('id', filter=Q(status='completed')),
+            paid=Count('id', filter=Q(payment_status='paid')),
+            payment_pending=Count('id', filter=Q(payment_status='pending')),
+            total_spent=Sum('amount', filter=Q(payment_status='paid')),
+        )
+        
+        orders = user_orders.select_related('service_package__service').order_by('-created_at')
+        paginator = Paginator(orders, settings.DASHBOARD_ORDERS_PAGE_SIZE)
+        # The aggregate already counted the orders; skip Paginator's COUNT(*)
+        paginator.count = summary['total']
+        page = paginator.get_page(self.request.GET.get('page'))
+        
+        # Archived orders (all completed or cancelled) still count towards the lifetime totals
+        archived = ArchivedOrder.objects.filter(user=self.request.user).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            paid=Count('id', filter=Q(payment_status='paid')),
+            total_spent=Sum('amount', filter=Q(payment_status='paid')),
+        )
+        for field, value in archived.items():
+            summary[field] = (summary[field] or 0) + (value or 0)
+        
+        context['order_summary'] = summary
+        context['page_obj'] = page
+        context['orders'] = page.object_list
+        context['recent_orders'] = page.object_list[:5]
+        context['active_orders'] = user_orders.filter(
+            status__in=['confirmed', 'in_progress']
+        ).select_related('service_package__service').order_by('-created_at')
         return context
 
 
@@ -268,6 +539,34 @@ class CreateOrderView(LoginRequiredMixin, CreateView):
         return redirect('writers_app:payment', order_id=order.id)
 
 
+class ArchivedOrderListView(LoginRequiredMixin, ListView):
+    template_name = 'archived_orders.html'
+    context_object_name = 'archived_orders'
+    
+    def get_paginate_by(self, queryset):
+        return settings.DASHBOARD_ORDERS_PAGE_SIZE
+    
+    def get_queryset(self):
+        return ArchivedOrder.objects.filter(user=self.request.user).defer('payload')
+
+
+class ArchivedOrderDetailView(LoginRequiredMixin, DetailView):
+    template_name = 'archived_order.html'
+    context_object_name = 'archived_order'
+    slug_field = 'order_number'
+    slug_url_kwarg = 'order_number'
+    
+    def get_queryset(self):
+        return ArchivedOrder.objects.filter(user=self.request.user)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        archive = unpack_order(self.object)
+        context['order'] = archive['order']
+        context['chat_messages'] = archive['messages']
+        return context
+
+
 class PaymentView(LoginRequiredMixin, TemplateView):
     template_name = 'payment.html'
     
@@ -304,7 +603,7 @@ class ChatView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         order_id = self.kwargs['order_id']
         context['order'] = get_object_or_404(Order, id=order_id, user=self.request.user)
-        context['messages'] = ChatMessage.objects.filter(order_id=order_id).order_by('created_at')
+        context['messages'] = ChatMessage.objects.filter(order_id=order_id).order_by('id')
         context['form'] = ChatMessageForm()
         return context
     
@@ -334,14 +633,24 @@ class AdminDashboardView(LoginRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_orders'] = Order.objects.count()
-        context['pending_orders'] = Order.objects.filter(status='pending').count()
-        context['total_users'] = User.objects.count()
-        context['recent_orders'] = Order.objects.order_by('-created_at')[:10]
+        # Totals come from the rollup maintained by signals, not full-table counts
+        context.update(get_admin_stats())
+        context['pending_orders'] = context['orders_by_status']['pending']
+        context['completed_orders'] = context['orders_by_status']['completed']
+        context['recent_orders'] = Order.objects.select_related(
+            'user', 'service_package__service'
+        ).order_by('-created_at')[:10]
         return context
 
 
 # API Views
+@never_cache
+@ensure_csrf_cookie
+def get_csrf_token(request):
+    """A fresh CSRF token, for forms on statically exported pages that can't embed one"""
+    return JsonResponse({'csrf_token': get_token(request)})
+
+
 def subscribe_newsletter(request):
     if request.method == 'POST':
         email = request.POST.get('email')
@@ -388,17 +697,99 @@ def verify_razorpay_payment(request):
     return JsonResponse({'success': False, 'error': 'Invalid request method'})
 
 
+CHAT_MESSAGE_FIELDS = (
+    'id', 'message', 'is_admin', 'created_at',
+    'user__username', 'user__first_name', 'user__last_name',
+)
+
+
+def serialize_chat_message(row):
+    """Shape a ChatMessage values() row for the chat API"""
+    if row['is_admin']:
+        user_name = 'Support Team'
+    else:
+        # Same as User.get_full_name(), without loading the user
+        user_name = f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__username']
+    return {
+        'id': row['id'],
+        'message': row['message'],
+        'is_admin': row['is_admin'],
+        'created_at': row['created_at'].isoformat(),
+        'user_name': user_name,
+    }
+
+
 @login_required
 def get_chat_messages(request, order_id):
-    order = get_object_or_404(Order, id=order_id, user=request.user)
-    messages = ChatMessage.objects.filter(order=order).order_by('created_at')
-    
-    messages_data = [{
-        'id': msg.id,
-        'message': msg.message,
-        'is_admin': msg.is_admin,
-        'created_at': msg.created_at.isoformat(),
-        'user_name': msg.user.get_full_name() if not msg.is_admin else 'Support Team'
-    } for msg in messages]
-    
-    return JsonResponse(messages_data, safe=False)
\ No newline at end of file
+    """
+    A page of an order's conversation, oldest first.
+
+    ?after_id= returns messages newer than that id (polling for the delta),
+    ?before_id= returns the page before it (scrolling back), and with
+    neither the latest page is returned. has_more says whether another
+    page exists in the requested direction.
+    """
+    order = get_object_or_404(Order.objects.only('id'), id=order_id, user=request.user)
+    limit = parse_limit(
+        request.GET.get('limit'), settings.CHAT_MESSAGES_PAGE_SIZE, settings.CHAT_MESSAGES_PAGE_SIZE_MAX
+    )
+
+    try:
+        after_id = int(request.GET['after_id']) if request.GET.get('after_id') else None
+        before_id = int(request.GET['before_id']) if request.GET.get('before_id') else None
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'after_id and before_id must be integers'}, status=400)
+
+    # The user columns come in through a join, so there is no query per message
+    messages = ChatMessage.objects.filter(order=order).values(*CHAT_MESSAGE_FIELDS)
+    if after_id is not None:
+        rows = list(messages.filter(id__gt=after_id).order_by('id')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        if before_id is not None:
+            messages = messages.filter(id__lt=before_id)
+        rows = list(messages.order_by('-id')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit][::-1]
+
+    return JsonResponse({
+        'messages': [serialize_chat_message(row) for row in rows],
+        'has_more': has_more,
+    })
+
+
+def pricing_matrix(request):
+    """Active services with their active packages and prices in every currency"""
+    matrix = get_pricing_matrix()
+    return JsonResponse({
+        'currencies': [code for code, name in ServicePackage.CURRENCY_CHOICES],
+        'services': matrix['services'],
+    })
+
+
+@csrf_exempt
+@require_POST
+def record_sample_view(request, sample_id):
+    """Count a sample being opened in the gallery; sent with navigator.sendBeacon"""
+    sample = get_object_or_404(ResumeSample.objects.only('id'), id=sample_id, is_active=True)
+    record_view(sample)
+    return HttpResponse(status=204)
+
+
+def samples_page(request, slug):
+    """Keyset-paginated samples for one category, used by the gallery's infinite scroll"""
+    samples = ResumeSample.objects.filter(
+        category__slug=slug, category__is_active=True, is_active=True
+    )
+    limit = parse_limit(request.GET.get('limit'), settings.SAMPLES_PAGE_SIZE, settings.SAMPLES_PAGE_SIZE_MAX)
+
+    try:
+        page, next_cursor = keyset_page(samples, SAMPLE_ORDERING, request.GET.get('cursor'), limit)
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'samples': [serialize_sample(sample) for sample in page],
+        'next_cursor': next_cursor,
+    })
\ No newline at end of file